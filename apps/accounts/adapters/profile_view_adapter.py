@@ -6,20 +6,47 @@ use cases while maintaining the same interface and behavior.
 """
 
 import logging
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render, redirect
+from django.shortcuts import render
 from django.contrib import messages
-from django.http import HttpRequest, HttpResponse
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.urls import reverse_lazy
+from django.views.decorators.http import condition
+from django.utils.translation import gettext_lazy as _
 
 from usecases.user.get_user_profile import GetUserProfileUseCase
 from usecases.user.update_user_profile import UpdateUserProfileUseCase
 from infrastructure.repositories.django_user_repository import DjangoUserRepository
 from infrastructure.repositories.django_profile_repository import DjangoProfileRepository
+from apps.accounts.forms import UserProfileForm
+from apps.accounts.models import Allergy, UserProfile, PROFILE_CACHE_TIMEOUT, profile_cache_key
 from core.exceptions import UserNotFoundError, ProfileNotFoundError
 
 logger = logging.getLogger(__name__)
 
+# Profile form fields read from POST data, single values and lists
+SCALAR_FORM_FIELDS = (
+    'first_name', 'last_name', 'email', 'skin_type', 'age_range',
+    'dermatological_other', 'allergies_other', 'product_style',
+    'routine_frequency', 'budget',
+)
+MULTI_FORM_FIELDS = ('skin_concerns', 'dermatological_conditions', 'allergies', 'objectives')
+
+# Redirect targets, resolved once on first use
+PROFILE_URL = reverse_lazy('accounts:profile')
+HOME_URL = reverse_lazy('accounts:home')
+
+# User-facing messages
+MSG_PROFILE_LOAD_ERROR = _("Erreur lors du chargement du profil.")
+MSG_UNEXPECTED_ERROR = _("Une erreur inattendue s'est produite.")
+MSG_PROFILE_UPDATED = _("Profil mis à jour avec succès !")
+MSG_PROFILE_UPDATE_ERROR = _("Erreur lors de la mise à jour du profil.")
+
 
 class ProfileViewAdapter:
     """
@@ -56,8 +83,13 @@ class ProfileViewAdapter:
             Django HTTP response
         """
         try:
-            # Get user profile using use case
-            profile_data = self._get_user_profile_use_case.execute(request.user.id)
+            # Get user profile using use case (cached, invalidated on save)
+            user_id = request.user.id
+            profile_data = cache.get_or_set(
+                profile_cache_key(user_id),
+                lambda: self._get_user_profile_use_case.execute(user_id),
+                PROFILE_CACHE_TIMEOUT
+            )
             
             if request.method == 'POST':
                 return self._handle_profile_update(request, profile_data)
@@ -65,13 +97,13 @@ class ProfileViewAdapter:
                 return self._render_profile_form(request, profile_data)
                 
         except (UserNotFoundError, ProfileNotFoundError) as e:
-            logger.error(f"Profile view error: {str(e)}")
-            messages.error(request, "Erreur lors du chargement du profil.")
-            return redirect('home')
+            logger.error("Profile view error: %s", e)
+            messages.error(request, MSG_PROFILE_LOAD_ERROR)
+            return HttpResponseRedirect(HOME_URL)
         except Exception as e:
-            logger.error(f"Unexpected error in profile view: {str(e)}")
-            messages.error(request, "Une erreur inattendue s'est produite.")
-            return redirect('home')
+            logger.error("Unexpected error in profile view: %s", e)
+            messages.error(request, MSG_UNEXPECTED_ERROR)
+            return HttpResponseRedirect(HOME_URL)
     
     def _handle_profile_update(self, request: HttpRequest, profile_data: Dict[str, Any]) -> HttpResponse:
         """
@@ -88,22 +120,23 @@ class ProfileViewAdapter:
             # Extract form data
             form_data = self._extract_form_data(request)
             
-            # Update profile using use case
-            updated_profile = self._update_user_profile_use_case.execute(
-                request.user.id,
-                form_data
-            )
+            # Update profile using use case (one transaction, profile row locked)
+            with transaction.atomic():
+                updated_profile = self._update_user_profile_use_case.execute(
+                    request.user.id,
+                    form_data
+                )
             
             if updated_profile:
-                messages.success(request, "Profil mis à jour avec succès !")
-                return redirect('profile')
+                messages.success(request, MSG_PROFILE_UPDATED)
+                return HttpResponseRedirect(PROFILE_URL)
             else:
-                messages.error(request, "Erreur lors de la mise à jour du profil.")
+                messages.error(request, MSG_PROFILE_UPDATE_ERROR)
                 return self._render_profile_form(request, profile_data)
                 
         except Exception as e:
-            logger.error(f"Error updating profile: {str(e)}")
-            messages.error(request, "Erreur lors de la mise à jour du profil.")
+            logger.error("Error updating profile: %s", e)
+            messages.error(request, MSG_PROFILE_UPDATE_ERROR)
             return self._render_profile_form(request, profile_data)
     
     def _extract_form_data(self, request: HttpRequest) -> Dict[str, Any]:
@@ -116,22 +149,10 @@ class ProfileViewAdapter:
         Returns:
             Dictionary of form data
         """
-        return {
-            'first_name': request.POST.get('first_name', ''),
-            'last_name': request.POST.get('last_name', ''),
-            'email': request.POST.get('email', ''),
-            'skin_type': request.POST.get('skin_type', ''),
-            'age_range': request.POST.get('age_range', ''),
-            'skin_concerns': request.POST.getlist('skin_concerns'),
-            'dermatological_conditions': request.POST.getlist('dermatological_conditions'),
-            'dermatological_other': request.POST.get('dermatological_other', ''),
-            'allergies': request.POST.getlist('allergies'),
-            'allergies_other': request.POST.get('allergies_other', ''),
-            'product_style': request.POST.get('product_style', ''),
-            'routine_frequency': request.POST.get('routine_frequency', ''),
-            'objectives': request.POST.getlist('objectives'),
-            'budget': request.POST.get('budget', ''),
-        }
+        post = request.POST
+        form_data = {name: post.get(name, '') for name in SCALAR_FORM_FIELDS}
+        form_data.update({name: post.getlist(name) for name in MULTI_FORM_FIELDS})
+        return form_data
     
     def _render_profile_form(self, request: HttpRequest, profile_data: Dict[str, Any]) -> HttpResponse:
         """
@@ -144,23 +165,64 @@ class ProfileViewAdapter:
         Returns:
             Django HTTP response
         """
-        # Import here to avoid circular imports
-        from apps.accounts.forms import UserProfileForm
-        
         # Create form with profile data
         form = UserProfileForm(initial=profile_data)
         
+        # Only the columns shown in the allergies table
+        allergies = Allergy.objects.filter(user_id=request.user.id).only(
+            'id', 'ingredient_name', 'severity', 'notes'
+        ).order_by('id')
+        
         return render(request, 'accounts/profile.html', {
             'form': form,
-            'profile': profile_data
+            'profile': profile_data,
+            'allergies': allergies
         })
 
 
-# Create global adapter instance
-profile_view_adapter = ProfileViewAdapter()
+@lru_cache(maxsize=1)
+def get_profile_view_adapter() -> ProfileViewAdapter:
+    """
+    Get the process-wide adapter instance.
+    
+    The adapter is built on first request instead of at import time,
+    so management commands and workers never pay for it.
+    """
+    return ProfileViewAdapter()
+
+
+def profile_etag(request: HttpRequest) -> Optional[str]:
+    """
+    Compute the ETag of the profile page for conditional GETs.
+    
+    The page depends on the profile row, the user's allergy records and the
+    session (CSRF token rotates on login), so all of them are part of the tag.
+    Pending flash messages disable the shortcut so they are always shown.
+    
+    Args:
+        request: Django HTTP request
+        
+    Returns:
+        ETag string, or None to render the page normally
+    """
+    if request.method != 'GET' or len(messages.get_messages(request)):
+        return None
+    
+    user = request.user
+    state = UserProfile.objects.filter(user_id=user.id).annotate(
+        allergy_count=Count('user__allergies'),
+        last_allergy_id=Max('user__allergies__id'),
+    ).values_list('updated_at', 'allergy_count', 'last_allergy_id').first()
+    if state is None:
+        return None
+    
+    updated_at, allergy_count, last_allergy_id = state
+    last_login = user.last_login.timestamp() if user.last_login else 0
+    return f'{user.id}-{updated_at.timestamp()}-{last_login}-{allergy_count}-{last_allergy_id}'
 
 
 @login_required
+@condition(etag_func=profile_etag)
 def profile_view(request: HttpRequest) -> HttpResponse:
     """
     Profile view using Clean Architecture adapter.
@@ -168,4 +230,4 @@ def profile_view(request: HttpRequest) -> HttpResponse:
     This view maintains the same interface as the original
     while using Clean Architecture internally.
     """
-    return profile_view_adapter.handle_profile_view(request)
+    return get_profile_view_adapter().handle_profile_view(request)
@@ -0,0 +1,28 @@
+"""
+Authentication backends for the accounts app.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+# Backend recorded in the session by the account views' logins
+PROFILE_BACKEND = 'apps.accounts.backends.ProfileModelBackend'
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    ModelBackend that loads the user's profile together with the user.
+
+    Every rendered page reads ``request.user.profile`` (navbar, footer,
+    premium context processor), so the profile is joined into the query
+    that resolves ``request.user`` from the session instead of being
+    fetched separately.
+    """
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related('profile').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
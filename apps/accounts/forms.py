@@ -2,12 +2,20 @@
 Forms for user registration and profile management.
 """
 
+import re
+
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
+from django.db.models import Value
+from django.db.models.functions import Lower
 from .models import UserProfile, Allergy
 
 
+# Letters, digits, '-' and '_', with at least one letter or digit
+USERNAME_RE = re.compile(r'[\w-]*[^\W_][\w-]*')
+
+
 class CustomUserCreationForm(UserCreationForm):
     """
     Formulaire d'inscription personnalisé avec email obligatoire.
@@ -72,7 +80,7 @@ class CustomUserCreationForm(UserCreationForm):
         if username:
             if len(username) < 3:
                 raise forms.ValidationError('Le nom d\'utilisateur doit contenir au moins 3 caractères.')
-            if not username.replace('_', '').replace('-', '').isalnum():
+            if not USERNAME_RE.fullmatch(username):
                 raise forms.ValidationError('Le nom d\'utilisateur ne peut contenir que des lettres, chiffres, tirets et underscores.')
         return username
     
@@ -82,11 +90,12 @@ class CustomUserCreationForm(UserCreationForm):
         if password1:
             if len(password1) < 8:
                 raise forms.ValidationError('Le mot de passe doit contenir au moins 8 caractères.')
-            if not any(c.isupper() for c in password1):
+            # map() over the str methods scans in C with the exact Unicode semantics
+            if not any(map(str.isupper, password1)):
                 raise forms.ValidationError('Le mot de passe doit contenir au moins une majuscule.')
-            if not any(c.islower() for c in password1):
+            if not any(map(str.islower, password1)):
                 raise forms.ValidationError('Le mot de passe doit contenir au moins une minuscule.')
-            if not any(c.isdigit() for c in password1):
+            if not any(map(str.isdigit, password1)):
                 raise forms.ValidationError('Le mot de passe doit contenir au moins un chiffre.')
         return password1
     
@@ -106,7 +115,10 @@ class CustomUserCreationForm(UserCreationForm):
     def clean_email(self):
         """Check that the email is unique."""
         email = self.cleaned_data.get('email')
-        if email and User.objects.filter(email__iexact=email).exists():
+        # Compare LOWER() on both sides so the LOWER(email) index is used
+        if email and User.objects.alias(
+            email_lower=Lower('email')
+        ).filter(email_lower=Lower(Value(email))).exists():
             raise forms.ValidationError(
                 'Cette adresse email est déjà utilisée par un autre compte.'
             )
@@ -121,6 +133,74 @@ class CustomUserCreationForm(UserCreationForm):
         return user
 
 
+class ChoiceSetMixin:
+    """
+    Validate submitted values with a set lookup.
+    
+    Django's ChoiceField.valid_value() scans the choices for every
+    submitted value; flat choices are hashed once here instead.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.choice_values = frozenset(str(value) for value, _ in self.choices)
+    
+    def valid_value(self, value):
+        return str(value) in self.choice_values
+
+
+class FastChoiceField(ChoiceSetMixin, forms.ChoiceField):
+    """ChoiceField with constant-time value validation."""
+
+
+class FastMultipleChoiceField(ChoiceSetMixin, forms.MultipleChoiceField):
+    """MultipleChoiceField with constant-time value validation."""
+
+
+# Multi-choice options shared by every UserProfileForm instance
+SKIN_CONCERN_CHOICES = (
+    ('acne', 'Acné'),
+    ('aging', 'Vieillissement'),
+    ('dryness', 'Sécheresse'),
+    ('oiliness', 'Excès de sébum'),
+    ('sensitivity', 'Sensibilité'),
+    ('hyperpigmentation', 'Taches'),
+    ('texture', 'Texture'),
+    ('pores', 'Pores dilatés'),
+)
+
+DERMATOLOGICAL_CONDITION_CHOICES = (
+    ('eczema', 'Eczéma'),
+    ('psoriasis', 'Psoriasis'),
+    ('rosacea', 'Rosacée'),
+    ('seborrheic_dermatitis', 'Dermatite séborrhéique'),
+)
+
+ALLERGY_CHOICES = (
+    ('fragrance', 'Parfum'),
+    ('essential_oils', 'Huiles essentielles'),
+    ('preservatives', 'Conservateurs'),
+    ('nickel_metals', 'Nickel / métaux'),
+)
+
+OBJECTIVE_CHOICES = (
+    ('anti-âge', 'Anti-âge'),
+    ('traitement acné', 'Traitement de l\'acné'),
+    ('hydratation', 'Hydratation'),
+    ('éclat', 'Éclat du teint'),
+    ('raffermissement', 'Raffermissement'),
+    ('apaisement', 'Apaisement'),
+    ('protection solaire', 'Protection solaire'),
+    ('exfoliation', 'Exfoliation'),
+)
+
+# Profile fields pre-populated as-is by UserProfileForm
+PROFILE_VALUE_FIELDS = (
+    'skin_type', 'age_range', 'product_style', 'routine_frequency', 'budget',
+    'dermatological_other', 'allergies_other',
+)
+
+
 class UserProfileForm(forms.ModelForm):
     """Form for updating user profile with all routine preferences."""
     
@@ -146,7 +226,7 @@ class UserProfileForm(forms.ModelForm):
     )
     
     # Skin type selection
-    skin_type = forms.ChoiceField(
+    skin_type = FastChoiceField(
         choices=UserProfile.SKIN_TYPE_CHOICES,
         widget=forms.RadioSelect,
         required=False,
@@ -154,7 +234,7 @@ class UserProfileForm(forms.ModelForm):
     )
     
     # Age range selection
-    age_range = forms.ChoiceField(
+    age_range = FastChoiceField(
         choices=UserProfile.AGE_RANGE_CHOICES,
         widget=forms.RadioSelect,
         required=False,
@@ -162,30 +242,16 @@ class UserProfileForm(forms.ModelForm):
     )
     
     # Skin concerns (multiple choice)
-    skin_concerns = forms.MultipleChoiceField(
-        choices=[
-            ('acne', 'Acné'),
-            ('aging', 'Vieillissement'),
-            ('dryness', 'Sécheresse'),
-            ('oiliness', 'Excès de sébum'),
-            ('sensitivity', 'Sensibilité'),
-            ('hyperpigmentation', 'Taches'),
-            ('texture', 'Texture'),
-            ('pores', 'Pores dilatés'),
-        ],
+    skin_concerns = FastMultipleChoiceField(
+        choices=SKIN_CONCERN_CHOICES,
         widget=forms.CheckboxSelectMultiple,
         required=False,
         label='Problèmes de peau'
     )
     
     # Dermatological conditions
-    dermatological_conditions = forms.MultipleChoiceField(
-        choices=[
-            ('eczema', 'Eczéma'),
-            ('psoriasis', 'Psoriasis'),
-            ('rosacea', 'Rosacée'),
-            ('seborrheic_dermatitis', 'Dermatite séborrhéique'),
-        ],
+    dermatological_conditions = FastMultipleChoiceField(
+        choices=DERMATOLOGICAL_CONDITION_CHOICES,
         widget=forms.CheckboxSelectMultiple,
         required=False,
         label='Pathologies dermatologiques connues'
@@ -199,13 +265,8 @@ class UserProfileForm(forms.ModelForm):
     )
     
     # Allergies
-    allergies = forms.MultipleChoiceField(
-        choices=[
-            ('fragrance', 'Parfum'),
-            ('essential_oils', 'Huiles essentielles'),
-            ('preservatives', 'Conservateurs'),
-            ('nickel_metals', 'Nickel / métaux'),
-        ],
+    allergies = FastMultipleChoiceField(
+        choices=ALLERGY_CHOICES,
         widget=forms.CheckboxSelectMultiple,
         required=False,
         label='Allergies connues'
@@ -219,7 +280,7 @@ class UserProfileForm(forms.ModelForm):
     )
     
     # Product style preference
-    product_style = forms.ChoiceField(
+    product_style = FastChoiceField(
         choices=UserProfile.PRODUCT_STYLE_CHOICES,
         widget=forms.RadioSelect,
         required=False,
@@ -227,7 +288,7 @@ class UserProfileForm(forms.ModelForm):
     )
     
     # Routine frequency
-    routine_frequency = forms.ChoiceField(
+    routine_frequency = FastChoiceField(
         choices=UserProfile.ROUTINE_FREQUENCY_CHOICES,
         widget=forms.RadioSelect,
         required=False,
@@ -235,17 +296,8 @@ class UserProfileForm(forms.ModelForm):
     )
     
     # Objectives (multiple choice)
-    objectives = forms.MultipleChoiceField(
-        choices=[
-            ('anti-âge', 'Anti-âge'),
-            ('traitement acné', 'Traitement de l\'acné'),
-            ('hydratation', 'Hydratation'),
-            ('éclat', 'Éclat du teint'),
-            ('raffermissement', 'Raffermissement'),
-            ('apaisement', 'Apaisement'),
-            ('protection solaire', 'Protection solaire'),
-            ('exfoliation', 'Exfoliation'),
-        ],
+    objectives = FastMultipleChoiceField(
+        choices=OBJECTIVE_CHOICES,
         widget=forms.CheckboxSelectMultiple,
         required=False,
         label='Objectifs principaux'
@@ -254,7 +306,7 @@ class UserProfileForm(forms.ModelForm):
 
     
     # Budget (legacy field)
-    budget = forms.ChoiceField(
+    budget = FastChoiceField(
         choices=UserProfile.BUDGET_CHOICES,
         widget=forms.RadioSelect,
         required=False,
@@ -280,45 +332,22 @@ class UserProfileForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if self.instance and self.instance.pk:
-            # Pre-populate multiple choice fields from JSON data
-            if self.instance.skin_concerns:
-                skin_concerns_list = self.instance.get_skin_concerns_list()
-                self.fields['skin_concerns'].initial = skin_concerns_list
-            
-            if self.instance.dermatological_conditions:
-                dermatological_conditions_list = self.instance.get_dermatological_conditions_list()
-                self.fields['dermatological_conditions'].initial = dermatological_conditions_list
-            
-            if self.instance.allergies:
-                allergies_list = self.instance.get_allergies_list()
-                self.fields['allergies'].initial = allergies_list
-            
-            if self.instance.objectives:
-                objectives_list = self.instance.get_objectives_list()
-                self.fields['objectives'].initial = objectives_list
-            
-            # Pre-populate single choice fields
-            if self.instance.skin_type:
-                self.fields['skin_type'].initial = self.instance.skin_type
-            
-            if self.instance.age_range:
-                self.fields['age_range'].initial = self.instance.age_range
-            
-            if self.instance.product_style:
-                self.fields['product_style'].initial = self.instance.product_style
-            
-            if self.instance.routine_frequency:
-                self.fields['routine_frequency'].initial = self.instance.routine_frequency
-            
-            if self.instance.budget:
-                self.fields['budget'].initial = self.instance.budget
-            
-            # Pre-populate text fields
-            if self.instance.dermatological_other:
-                self.fields['dermatological_other'].initial = self.instance.dermatological_other
-            
-            if self.instance.allergies_other:
-                self.fields['allergies_other'].initial = self.instance.allergies_other
+            self._populate_initial(self.instance)
+    
+    def _populate_initial(self, instance):
+        """Pre-populate field initial values from the profile instance."""
+        fields = self.fields
+        
+        # Multiple choice fields are stored as JSON, parsed in one call
+        for name, values in instance.get_all_choice_lists().items():
+            if values:
+                fields[name].initial = values
+        
+        # Single choice and text fields are copied as-is
+        for name in PROFILE_VALUE_FIELDS:
+            value = getattr(instance, name)
+            if value:
+                fields[name].initial = value
 
 
 class AllergyForm(forms.ModelForm):
@@ -338,9 +367,11 @@ class AllergyForm(forms.ModelForm):
     def clean_ingredient_name(self):
         """Ensure ingredient name is unique for the user."""
         ingredient_name = self.cleaned_data.get('ingredient_name')
-        if self.user and Allergy.objects.filter(
-            user=self.user, 
-            ingredient_name__iexact=ingredient_name
+        if self.user and Allergy.objects.alias(
+            name_lower=Lower('ingredient_name')
+        ).filter(
+            user=self.user,
+            name_lower=Lower(Value(ingredient_name))
         ).exclude(pk=self.instance.pk if self.instance else None).exists():
             raise forms.ValidationError('This allergy is already registered.')
         return ingredient_name
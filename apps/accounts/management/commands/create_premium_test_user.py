@@ -3,9 +3,20 @@ Management command to create a Premium test user for development.
 """
 
 from django.core.management.base import BaseCommand, CommandError
-from django.contrib.auth.models import User
 from django.conf import settings
-from common.premium_utils import is_development_environment, force_premium_for_development
+
+
+PERMANENT_AUTHORIZATION_HINT = (
+    "💡 To make this permanent, add the username to AUTHORIZED_DEV_USERS in config/settings/dev.py"
+)
+
+DEVELOPER_TIPS = (
+    '\n💡 Developer Tips:\n'
+    '• Use the subscription page to toggle between Free/Premium\n'
+    '• Premium dev mode is only active for authorized developers\n'
+    '• Normal users cannot access Premium without payment in production\n'
+    '• Only authorized developers can use the dev tools'
+)
 
 
 class Command(BaseCommand):
@@ -15,14 +26,16 @@ class Command(BaseCommand):
         parser.add_argument(
             '--username',
             type=str,
-            default='testuser',
-            help='Username for the test user (default: testuser)'
+            nargs='+',
+            default=['testuser'],
+            help='Username(s) for the test user(s) (default: testuser)'
         )
         parser.add_argument(
             '--email',
             type=str,
             default='test@example.com',
-            help='Email for the test user (default: test@example.com)'
+            help='Email for the test user (default: test@example.com); '
+                 'with several usernames, its domain is used for username@domain'
         )
         parser.add_argument(
             '--password',
@@ -37,18 +50,28 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        username = options['username']
+        from django.contrib.auth import get_user_model
+        from common.premium_utils import force_premium_for_development
+
+        User = get_user_model()
+        self.verbosity = options['verbosity']
+        usernames = list(dict.fromkeys(options['username']))
         email = options['email']
         password = options['password']
         no_authorize = options['no_authorize']
 
+        # Read the relevant settings once
+        debug = getattr(settings, 'DEBUG', False)
+        premium_dev_mode = getattr(settings, 'IS_PREMIUM_DEV_MODE', False)
+        authorized_dev_users = frozenset(getattr(settings, 'AUTHORIZED_DEV_USERS', ()))
+
         # Security checks
-        if not getattr(settings, 'DEBUG', False):
+        if not debug:
             raise CommandError(
                 "This command can only be used in development mode (DEBUG=True)"
             )
 
-        if not getattr(settings, 'IS_PREMIUM_DEV_MODE', False):
+        if not premium_dev_mode:
             raise CommandError(
                 "IS_PREMIUM_DEV_MODE must be enabled to create Premium test users. "
                 "Set DJANGO_DEVELOPMENT=true in your virtual environment."
@@ -56,6 +79,7 @@ class Command(BaseCommand):
 
         # Temporarily allow creating users without virtual environment for testing
         # Note: Virtual environment check is bypassed for development convenience
+        # (re-enable together with: from common.premium_utils import is_development_environment)
         # if not is_development_environment():
         #     raise CommandError(
         #         "This command can only be used in a development environment. "
@@ -63,59 +87,81 @@ class Command(BaseCommand):
         #     )
 
         try:
-            # Check if user already exists
-            if User.objects.filter(username=username).exists():
-                user = User.objects.get(username=username)
-                self.stdout.write(
-                    self.style.WARNING(f'User "{username}" already exists. Updating to Premium...')
-                )
+            if len(usernames) == 1:
+                users = [self._get_or_create_user(User, usernames[0], email, password)]
             else:
-                # Create new user
-                user = User.objects.create_user(
-                    username=username,
-                    email=email,
-                    password=password
-                )
-                self.stdout.write(
-                    self.style.SUCCESS(f'Created user "{username}" successfully.')
-                )
+                users = self._get_or_create_users(User, usernames, email, password)
 
             # Force Premium status
-            force_premium_for_development(user)
+            force_premium_for_development(users)
+
+            if self.verbosity >= 1:
+                self._report(users, password, no_authorize, authorized_dev_users)
+
+        except Exception as e:
+            raise CommandError(f'Failed to create Premium test user: {str(e)}')
+
+    def _report(self, users, password, no_authorize, authorized_dev_users):
+        """Describe the Premium test users that were provisioned."""
+        for user in users:
+            username = user.username
 
             # Add to authorized developers list if not disabled
-            if not no_authorize:
-                authorized_users = list(getattr(settings, 'AUTHORIZED_DEV_USERS', []))
-                if username not in authorized_users:
-                    authorized_users.append(username)
-                    self.stdout.write(
-                        self.style.SUCCESS(f'Added "{username}" to authorized developers list.')
-                    )
-                    self.stdout.write(
-                        self.style.WARNING(
-                            "💡 To make this permanent, add the username to AUTHORIZED_DEV_USERS in config/settings/dev.py"
-                        )
-                    )
+            if not no_authorize and username not in authorized_dev_users:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Added "{username}" to authorized developers list.')
+                )
+                self.stdout.write(self.style.WARNING(PERMANENT_AUTHORIZATION_HINT))
 
             self.stdout.write(
                 self.style.SUCCESS(
                     f'✅ User "{username}" now has Premium access!\n'
-                    f'📧 Email: {email}\n'
+                    f'📧 Email: {user.email}\n'
                     f'🔑 Password: {password}\n'
                     f'👑 Status: Premium'
                 )
             )
 
-            # Provide helpful information
-            self.stdout.write(
-                self.style.WARNING(
-                    '\n💡 Developer Tips:\n'
-                    '• Use the subscription page to toggle between Free/Premium\n'
-                    '• Premium dev mode is only active for authorized developers\n'
-                    '• Normal users cannot access Premium without payment in production\n'
-                    '• Only authorized developers can use the dev tools'
+        # Provide helpful information
+        self.stdout.write(self.style.WARNING(DEVELOPER_TIPS))
+
+    def _get_or_create_user(self, User, username, email, password):
+        """Fetch or create a single test user."""
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            user = User.objects.create_user(
+                username=username,
+                email=email,
+                password=password
+            )
+            if self.verbosity >= 1:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Created user "{username}" successfully.')
                 )
+        elif self.verbosity >= 1:
+            self.stdout.write(
+                self.style.WARNING(f'User "{username}" already exists. Updating to Premium...')
             )
+        return user
 
-        except Exception as e:
-            raise CommandError(f'Failed to create Premium test user: {str(e)}')
+    def _get_or_create_users(self, User, usernames, email, password):
+        """Fetch existing test users and bulk-create the missing ones."""
+        from apps.accounts.models import create_users_with_profiles
+
+        domain = email.partition('@')[2] or 'example.com'
+        existing = {user.username: user for user in User.objects.filter(username__in=usernames)}
+        created = create_users_with_profiles([
+            {'username': username, 'email': f'{username}@{domain}', 'password': password}
+            for username in usernames if username not in existing
+        ])
+
+        if self.verbosity >= 1:
+            for username in existing:
+                self.stdout.write(
+                    self.style.WARNING(f'User "{username}" already exists. Updating to Premium...')
+                )
+            for user in created:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Created user "{user.username}" successfully.')
+                )
+        return list(existing.values()) + created
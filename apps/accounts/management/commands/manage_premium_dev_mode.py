@@ -4,7 +4,55 @@ Management command to manage Premium dev mode for development.
 
 import os
 from django.core.management.base import BaseCommand, CommandError
-from common.premium_utils import get_development_environment_info
+
+
+DEV_MODE_ENABLED_MESSAGE = (
+    "✅ Premium dev mode enabled!\n"
+    "💡 Set DJANGO_DEVELOPMENT=true in your virtual environment\n"
+    "🔄 Restart your Django server for changes to take effect\n"
+    "👥 Only authorized developers will have Premium access"
+)
+
+DEV_MODE_DISABLED_MESSAGE = (
+    "✅ Premium dev mode disabled!\n"
+    "💡 Remove DJANGO_DEVELOPMENT=true from your environment\n"
+    "🔄 Restart your Django server for changes to take effect"
+)
+
+ENVIRONMENT_OK_MESSAGE = (
+    "✅ Environment is properly configured for development!\n"
+    "🎉 Premium dev mode is active and ready for testing"
+)
+
+FIX_ENVIRONMENT_HINT = (
+    "\n💡 To fix these issues:\n"
+    "1. Activate your virtual environment\n"
+    "2. Set DJANGO_DEVELOPMENT=true\n"
+    "3. Ensure DEBUG=True in settings\n"
+    "4. Add authorized developers to AUTHORIZED_DEV_USERS\n"
+    "5. Restart your Django server"
+)
+
+ADD_DEVELOPERS_HINT = (
+    '\n💡 To add developers:\n'
+    '   python manage.py manage_premium_dev_mode add-authorized --username username'
+)
+
+ADD_AUTHORIZED_TEMPLATE = (
+    "⚠️  To add '{username}' to authorized developers:\n"
+    "1. Edit config/settings/dev.py\n"
+    "2. Add '{username}' to AUTHORIZED_DEV_USERS list\n"
+    "3. Or set AUTHORIZED_DEV_USERS environment variable\n"
+    "4. Restart your Django server"
+)
+
+REMOVE_AUTHORIZED_TEMPLATE = (
+    "⚠️  To remove '{username}' from authorized developers:\n"
+    "1. Edit config/settings/dev.py\n"
+    "2. Remove '{username}' from AUTHORIZED_DEV_USERS list\n"
+    "3. Or set AUTHORIZED_DEV_USERS environment variable\n"
+    "4. Restart your Django server"
+)
 
 
 class Command(BaseCommand):
@@ -24,6 +72,7 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         action = options['action']
+        self.verbosity = options['verbosity']
         username = options.get('username')
 
         if action == 'status':
@@ -47,34 +96,36 @@ class Command(BaseCommand):
 
     def show_status(self):
         """Show current Premium dev mode status."""
+        from common.premium_utils import get_development_environment_info
         env_info = get_development_environment_info()
         
-        self.stdout.write('\n' + '='*60)
-        self.stdout.write('PREMIUM DEV MODE STATUS')
-        self.stdout.write('='*60)
-        
-        self.stdout.write(f'🔧 Virtual Environment: {"✅ Yes" if env_info["is_virtual_environment"] else "❌ No"}')
-        self.stdout.write(f'🛠️  Development Environment: {"✅ Yes" if env_info["is_development_environment"] else "❌ No"}')
-        self.stdout.write(f'🐛 Debug Mode: {"✅ Yes" if env_info["debug_mode"] else "❌ No"}')
-        self.stdout.write(f'👑 Premium Dev Mode: {"✅ Enabled" if env_info["premium_dev_mode"] else "❌ Disabled"}')
-        self.stdout.write(f'⚙️  Settings Module: {env_info["settings_module"]}')
-        
-        self.stdout.write('\n👥 Authorized Developers:')
+        lines = [
+            '\n' + '='*60,
+            'PREMIUM DEV MODE STATUS',
+            '='*60,
+            f'🔧 Virtual Environment: {"✅ Yes" if env_info["is_virtual_environment"] else "❌ No"}',
+            f'🛠️  Development Environment: {"✅ Yes" if env_info["is_development_environment"] else "❌ No"}',
+            f'🐛 Debug Mode: {"✅ Yes" if env_info["debug_mode"] else "❌ No"}',
+            f'👑 Premium Dev Mode: {"✅ Enabled" if env_info["premium_dev_mode"] else "❌ Disabled"}',
+            f'⚙️  Settings Module: {env_info["settings_module"]}',
+            '\n👥 Authorized Developers:',
+        ]
         if env_info["authorized_dev_users"]:
-            for user in env_info["authorized_dev_users"]:
-                self.stdout.write(f'   ✅ {user}')
+            lines.extend(f'   ✅ {user}' for user in env_info["authorized_dev_users"])
         else:
-            self.stdout.write('   ❌ No authorized developers')
+            lines.append('   ❌ No authorized developers')
         
-        self.stdout.write('\n📋 Environment Variables:')
+        lines.append('\n📋 Environment Variables:')
         for var, value in env_info["development_vars"].items():
             status = "✅ Set" if value else "❌ Not set"
-            self.stdout.write(f'   {var}: {value or "Not set"} ({status})')
+            lines.append(f'   {var}: {value or "Not set"} ({status})')
         
-        self.stdout.write('\n' + '='*60)
+        lines.append('\n' + '='*60)
+        self.stdout.write('\n'.join(lines))
 
     def enable_dev_mode(self):
         """Enable Premium dev mode."""
+        from common.premium_utils import get_development_environment_info
         env_info = get_development_environment_info()
         
         # Temporarily allow enabling without virtual environment for testing
@@ -94,14 +145,8 @@ class Command(BaseCommand):
         # Set environment variable
         os.environ['DJANGO_DEVELOPMENT'] = 'true'
         
-        self.stdout.write(
-            self.style.SUCCESS(
-                "✅ Premium dev mode enabled!\n"
-                "💡 Set DJANGO_DEVELOPMENT=true in your virtual environment\n"
-                "🔄 Restart your Django server for changes to take effect\n"
-                "👥 Only authorized developers will have Premium access"
-            )
-        )
+        if self.verbosity >= 1:
+            self.stdout.write(self.style.SUCCESS(DEV_MODE_ENABLED_MESSAGE))
 
     def disable_dev_mode(self):
         """Disable Premium dev mode."""
@@ -109,21 +154,15 @@ class Command(BaseCommand):
         if 'DJANGO_DEVELOPMENT' in os.environ:
             del os.environ['DJANGO_DEVELOPMENT']
         
-        self.stdout.write(
-            self.style.WARNING(
-                "✅ Premium dev mode disabled!\n"
-                "💡 Remove DJANGO_DEVELOPMENT=true from your environment\n"
-                "🔄 Restart your Django server for changes to take effect"
-            )
-        )
+        if self.verbosity >= 1:
+            self.stdout.write(self.style.WARNING(DEV_MODE_DISABLED_MESSAGE))
 
     def check_environment(self):
         """Check if environment is properly configured for development."""
+        from common.premium_utils import get_development_environment_info
         env_info = get_development_environment_info()
         
-        self.stdout.write('\n🔍 ENVIRONMENT CHECK')
-        self.stdout.write('='*40)
-        
+        lines = ['\n🔍 ENVIRONMENT CHECK', '='*40]
         issues = []
         
         if not env_info["is_virtual_environment"]:
@@ -142,63 +181,44 @@ class Command(BaseCommand):
             issues.append("❌ No authorized developers configured")
         
         if issues:
-            self.stdout.write(
+            lines.append(
                 self.style.ERROR(
                     "❌ Environment issues found:\n" + "\n".join(issues)
                 )
             )
-            self.stdout.write(
-                "\n💡 To fix these issues:\n"
-                "1. Activate your virtual environment\n"
-                "2. Set DJANGO_DEVELOPMENT=true\n"
-                "3. Ensure DEBUG=True in settings\n"
-                "4. Add authorized developers to AUTHORIZED_DEV_USERS\n"
-                "5. Restart your Django server"
-            )
+            if self.verbosity >= 1:
+                lines.append(FIX_ENVIRONMENT_HINT)
         else:
-            self.stdout.write(
-                self.style.SUCCESS(
-                    "✅ Environment is properly configured for development!\n"
-                    "🎉 Premium dev mode is active and ready for testing"
-                )
-            )
+            lines.append(self.style.SUCCESS(ENVIRONMENT_OK_MESSAGE))
+        
+        self.stdout.write('\n'.join(lines))
 
     def list_authorized_users(self):
         """List all authorized developers."""
+        from common.premium_utils import get_development_environment_info
         env_info = get_development_environment_info()
         
-        self.stdout.write('\n👥 AUTHORIZED DEVELOPERS')
-        self.stdout.write('='*30)
+        lines = ['\n👥 AUTHORIZED DEVELOPERS', '='*30]
         
         if env_info["authorized_dev_users"]:
-            for i, user in enumerate(env_info["authorized_dev_users"], 1):
-                self.stdout.write(f'{i}. {user}')
+            lines.extend(
+                f'{i}. {user}' for i, user in enumerate(env_info["authorized_dev_users"], 1)
+            )
         else:
-            self.stdout.write('❌ No authorized developers configured')
+            lines.append('❌ No authorized developers configured')
         
-        self.stdout.write('\n💡 To add developers:')
-        self.stdout.write('   python manage.py manage_premium_dev_mode add-authorized --username username')
+        if self.verbosity >= 1:
+            lines.append(ADD_DEVELOPERS_HINT)
+        self.stdout.write('\n'.join(lines))
 
     def add_authorized_user(self, username):
         """Add a user to the authorized developers list."""
         self.stdout.write(
-            self.style.WARNING(
-                f"⚠️  To add '{username}' to authorized developers:\n"
-                "1. Edit config/settings/dev.py\n"
-                "2. Add '{username}' to AUTHORIZED_DEV_USERS list\n"
-                "3. Or set AUTHORIZED_DEV_USERS environment variable\n"
-                "4. Restart your Django server"
-            )
+            self.style.WARNING(ADD_AUTHORIZED_TEMPLATE.format(username=username))
         )
 
     def remove_authorized_user(self, username):
         """Remove a user from the authorized developers list."""
         self.stdout.write(
-            self.style.WARNING(
-                f"⚠️  To remove '{username}' from authorized developers:\n"
-                "1. Edit config/settings/dev.py\n"
-                "2. Remove '{username}' from AUTHORIZED_DEV_USERS list\n"
-                "3. Or set AUTHORIZED_DEV_USERS environment variable\n"
-                "4. Restart your Django server"
-            )
+            self.style.WARNING(REMOVE_AUTHORIZED_TEMPLATE.format(username=username))
         )
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.2 on 2026-10-18 03:52
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_alter_allergy_severity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # auth_user belongs to django.contrib.auth, so its expression index
+        # is created here with plain SQL (valid for SQLite and PostgreSQL)
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS auth_user_email_lower_idx ON auth_user (LOWER(email));',
+            reverse_sql='DROP INDEX IF EXISTS auth_user_email_lower_idx;',
+        ),
+        migrations.AddIndex(
+            model_name='allergy',
+            index=models.Index(models.F('user'), django.db.models.functions.text.Lower('ingredient_name'), name='allergy_user_name_lower_idx'),
+        ),
+    ]
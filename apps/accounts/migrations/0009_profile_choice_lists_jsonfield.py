@@ -0,0 +1,54 @@
+# Generated by Django 5.0.2 on 2026-10-18 03:59
+
+import json
+
+from django.db import migrations, models
+
+
+CHOICE_LIST_FIELDS = ('skin_concerns', 'dermatological_conditions', 'allergies', 'objectives')
+
+
+def normalize_choice_lists(apps, schema_editor):
+    """Rewrite empty or malformed JSON text as '[]' so the columns can be cast to JSON."""
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    for profile in UserProfile.objects.only('id', *CHOICE_LIST_FIELDS).iterator():
+        for name in CHOICE_LIST_FIELDS:
+            try:
+                values = json.loads(getattr(profile, name) or '[]')
+            except (json.JSONDecodeError, TypeError):
+                values = []
+            if not isinstance(values, list):
+                values = []
+            setattr(profile, name, json.dumps(values))
+        profile.save(update_fields=CHOICE_LIST_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_email_lower_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_choice_lists, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='allergies',
+            field=models.JSONField(blank=True, default=list, help_text='Allergies connues'),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='dermatological_conditions',
+            field=models.JSONField(blank=True, default=list, help_text='Pathologies dermatologiques'),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='objectives',
+            field=models.JSONField(blank=True, default=list, help_text='Objectifs principaux'),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='skin_concerns',
+            field=models.JSONField(blank=True, default=list, help_text='Problèmes de peau'),
+        ),
+    ]
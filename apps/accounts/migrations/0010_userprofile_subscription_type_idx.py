@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-18 04:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_profile_choice_lists_jsonfield'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='subscription_type',
+            field=models.CharField(choices=[('free', 'Free'), ('premium', 'Premium'), ('pro', 'Pro')], db_index=True, default='free', max_length=10),
+        ),
+    ]
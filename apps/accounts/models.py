@@ -2,11 +2,35 @@
 Models for user accounts, profiles, and allergies.
 """
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
+from common.premium_utils import is_premium_user
+
+
+# Cached profile data is invalidated on every save, the timeout only bounds staleness
+PROFILE_CACHE_TIMEOUT = 600
+
+
+def profile_cache_key(user_id: int) -> str:
+    """Get the cache key holding the profile data of a user."""
+    return f'profile_{user_id}'
+
+
+def allergies_cache_key(user_id: int) -> str:
+    """Get the cache key holding the allergy records of a user."""
+    return f'allergies_{user_id}'
+
+
+def premium_context_version_key(user_id: int) -> str:
+    """Get the cache key versioning the Premium AI responses cached for a user."""
+    return f'premium_context_version_{user_id}'
+
 
 class UserProfile(models.Model):
     """Extended user profile with skincare preferences."""
@@ -60,11 +84,15 @@ class UserProfile(models.Model):
         ('comprehensive', 'Complète (20–30 min)'),
     ]
     
+    # Multi-choice preferences stored as JSON lists
+    CHOICE_LIST_FIELDS = ('skin_concerns', 'dermatological_conditions', 'allergies', 'objectives')
+    
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     subscription_type = models.CharField(
         max_length=10, 
         choices=SUBSCRIPTION_CHOICES, 
-        default='free'
+        default='free',
+        db_index=True
     )
     
     # Routine preferences (transferred from generate_routine form)
@@ -75,15 +103,15 @@ class UserProfile(models.Model):
         help_text='Type de routine préféré'
     )
     skin_type = models.CharField(max_length=50, blank=True, choices=SKIN_TYPE_CHOICES, default='')
-    skin_concerns = models.TextField(blank=True, help_text='Problèmes de peau (JSON format)')
+    skin_concerns = models.JSONField(default=list, blank=True, help_text='Problèmes de peau')
     age_range = models.CharField(max_length=10, blank=True, choices=AGE_RANGE_CHOICES)
-    dermatological_conditions = models.TextField(blank=True, help_text='Pathologies dermatologiques (JSON format)')
+    dermatological_conditions = models.JSONField(default=list, blank=True, help_text='Pathologies dermatologiques')
     dermatological_other = models.CharField(max_length=200, blank=True, help_text='Autre pathologie dermatologique')
-    allergies = models.TextField(blank=True, help_text='Allergies connues (JSON format)')
+    allergies = models.JSONField(default=list, blank=True, help_text='Allergies connues')
     allergies_other = models.CharField(max_length=200, blank=True, help_text='Autre allergie')
     product_style = models.CharField(max_length=20, blank=True, choices=PRODUCT_STYLE_CHOICES)
     routine_frequency = models.CharField(max_length=20, blank=True, choices=ROUTINE_FREQUENCY_CHOICES)
-    objectives = models.TextField(blank=True, help_text='Objectifs principaux (JSON format)')
+    objectives = models.JSONField(default=list, blank=True, help_text='Objectifs principaux')
     
     # Legacy fields (kept for compatibility)
     budget = models.CharField(max_length=20, blank=True, choices=BUDGET_CHOICES)
@@ -101,70 +129,49 @@ class UserProfile(models.Model):
         
         This method uses the premium_utils module to handle both
         production subscription checks and developer testing mode.
+        The result is cached on the user for the request lifetime, so
+        repeated checks are attribute lookups until clear_premium_cache().
         """
-        from common.premium_utils import is_premium_user
         return is_premium_user(self.user)
     
+    def get_all_choice_lists(self) -> dict:
+        """Get all multi-choice fields as lists, keyed by field name."""
+        return {name: getattr(self, name) or [] for name in self.CHOICE_LIST_FIELDS}
+    
+    # The list accessors below predate the JSONField columns and are kept
+    # as thin passthroughs for existing callers.
+    
     def get_skin_concerns_list(self) -> list:
-        """Get skin concerns as a list from JSON field."""
-        import json
-        try:
-            if self.skin_concerns:
-                # Decode with ensure_ascii=False to handle Unicode properly
-                return json.loads(self.skin_concerns) if self.skin_concerns else []
-            return []
-        except (json.JSONDecodeError, TypeError):
-            return []
+        """Get skin concerns as a list."""
+        return self.skin_concerns or []
     
     def set_skin_concerns_list(self, concerns_list: list):
-        """Set skin concerns as JSON from list."""
-        import json
-        self.skin_concerns = json.dumps(concerns_list) if concerns_list else ''
+        """Set skin concerns from a list."""
+        self.skin_concerns = list(concerns_list or [])
     
     def get_dermatological_conditions_list(self) -> list:
-        """Get dermatological conditions as a list from JSON field."""
-        import json
-        try:
-            if self.dermatological_conditions:
-                return json.loads(self.dermatological_conditions)
-            return []
-        except (json.JSONDecodeError, TypeError):
-            return []
+        """Get dermatological conditions as a list."""
+        return self.dermatological_conditions or []
     
     def set_dermatological_conditions_list(self, conditions_list: list):
-        """Set dermatological conditions as JSON from list."""
-        import json
-        self.dermatological_conditions = json.dumps(conditions_list) if conditions_list else ''
+        """Set dermatological conditions from a list."""
+        self.dermatological_conditions = list(conditions_list or [])
     
     def get_allergies_list(self) -> list:
-        """Get allergies as a list from JSON field."""
-        import json
-        try:
-            if self.allergies:
-                return json.loads(self.allergies)
-            return []
-        except (json.JSONDecodeError, TypeError):
-            return []
+        """Get allergies as a list."""
+        return self.allergies or []
     
     def set_allergies_list(self, allergies_list: list):
-        """Set allergies as JSON from list."""
-        import json
-        self.allergies = json.dumps(allergies_list) if allergies_list else ''
+        """Set allergies from a list."""
+        self.allergies = list(allergies_list or [])
     
     def get_objectives_list(self) -> list:
-        """Get objectives as a list from JSON field."""
-        import json
-        try:
-            if self.objectives:
-                return json.loads(self.objectives)
-            return []
-        except (json.JSONDecodeError, TypeError):
-            return []
+        """Get objectives as a list."""
+        return self.objectives or []
     
     def set_objectives_list(self, objectives_list: list):
-        """Set objectives as JSON from list."""
-        import json
-        self.objectives = json.dumps(objectives_list) if objectives_list else ''
+        """Set objectives from a list."""
+        self.objectives = list(objectives_list or [])
 
 
 class Allergy(models.Model):
@@ -185,11 +192,38 @@ class Allergy(models.Model):
     class Meta:
         verbose_name_plural = 'Allergies'
         unique_together = ['user', 'ingredient_name']
+        indexes = [
+            # Case-insensitive duplicate check in AllergyForm
+            models.Index(F('user'), Lower('ingredient_name'), name='allergy_user_name_lower_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.ingredient_name}"
 
 
+def create_users_with_profiles(user_dicts):
+    """
+    Create many users and their profiles with one INSERT per table.
+    
+    bulk_create() does not send post_save, so the profiles normally created by
+    create_user_profile are inserted here in bulk as well. Each dict holds User
+    field values; an optional 'password' key is hashed like create_user() does.
+    """
+    users = []
+    for data in user_dicts:
+        data = dict(data)
+        password = data.pop('password', None)
+        data['email'] = User.objects.normalize_email(data.get('email', ''))
+        user = User(**data)
+        user.set_password(password)
+        users.append(user)
+    
+    with transaction.atomic():
+        users = User.objects.bulk_create(users)
+        UserProfile.objects.bulk_create([UserProfile(user=user) for user in users])
+    return users
+
+
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     """Create user profile when a new user is created."""
@@ -197,7 +231,24 @@ def create_user_profile(sender, instance, created, **kwargs):
         UserProfile.objects.create(user=instance)
 
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    """Save user profile when user is saved."""
-    instance.profile.save()
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    """Drop cached profile data once the profile change is committed."""
+    keys = [profile_cache_key(instance.user_id), premium_context_version_key(instance.user_id)]
+    # Before commit, a concurrent read would cache the old row again
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_profile_cache(sender, instance, **kwargs):
+    """Drop cached profile data once the user (name, email) change is committed."""
+    # Keys are built now: a deleted instance has lost its pk by commit time
+    keys = [profile_cache_key(instance.pk), premium_context_version_key(instance.pk)]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@receiver([post_save, post_delete], sender=Allergy)
+def invalidate_allergies_cache(sender, instance, **kwargs):
+    """Drop cached allergy records once a change to one of them is committed."""
+    keys = [allergies_cache_key(instance.user_id), premium_context_version_key(instance.user_id)]
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -2,15 +2,20 @@
 Views for user authentication and profile management.
 """
 
+import logging
+
 from django.shortcuts import render, redirect
-from django.contrib.auth import login, logout, authenticate
+from django.contrib.auth import login, logout
+from django.contrib.auth.signals import user_login_failed
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db import transaction
-from .forms import CustomUserCreationForm
+from django.db.models import Value
+from django.db.models.functions import Lower
 
-from .forms import UserProfileForm, AllergyForm
-from .models import UserProfile, Allergy
+from .backends import PROFILE_BACKEND
+from .forms import CustomUserCreationForm, UserProfileForm, AllergyForm
+from .models import Allergy
 from common.premium_utils import force_premium_status_update
 from django.contrib.auth.models import User
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
@@ -19,6 +24,7 @@ from django.core.signing import TimestampSigner, BadSignature, SignatureExpired
 from django.core.mail import send_mail
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
 
 
 
@@ -48,7 +54,7 @@ def signup_view(request):
             user = form.save()
             user.is_active = True
             user.save()
-            login(request, user)
+            login(request, user, backend=PROFILE_BACKEND)
             messages.success(request, 'Inscription réussie ! Bienvenue sur BeautyScan.')
             return redirect('accounts:home')
         else:
@@ -61,6 +67,15 @@ def signup_view(request):
     return render(request, 'accounts/signup.html', {'form': form})
 
 
+def _user_lookup(identifier):
+    """Queryset matching a login identifier, by email when it contains '@'."""
+    if '@' in identifier:
+        return User.objects.alias(email_lower=Lower('email')).filter(
+            email_lower=Lower(Value(identifier))
+        )
+    return User.objects.filter(username=identifier)
+
+
 def login_view(request):
     """Connexion via nom d'utilisateur ou email + mot de passe."""
     if request.method == 'POST':
@@ -75,33 +90,27 @@ def login_view(request):
             messages.error(request, "Veuillez saisir votre mot de passe.")
             return render(request, 'accounts/login.html')
         
-        user = None
-        if '@' in identifier:
-            # Connexion par email
-            try:
-                user_obj = User.objects.get(email__iexact=identifier)
-                if not user_obj.is_active:
-                    messages.error(request, "Votre compte n'est pas encore activé.")
-                    return render(request, 'accounts/login.html')
-                user = authenticate(request, username=user_obj.username, password=password)
-            except User.DoesNotExist:
-                user = None
+        # One query loads the account with the profile every page reads afterwards
+        user = _user_lookup(identifier).select_related('profile').first()
+        if user is None:
+            # Hash anyway so unknown accounts take as long as wrong passwords
+            User().set_password(password)
         else:
-            # Connexion par nom d'utilisateur
-            try:
-                user_obj = User.objects.get(username=identifier)
-                if not user_obj.is_active:
-                    messages.error(request, "Votre compte n'est pas encore activé.")
-                    return render(request, 'accounts/login.html')
-                user = authenticate(request, username=identifier, password=password)
-            except User.DoesNotExist:
+            if not user.is_active:
+                messages.error(request, "Votre compte n'est pas encore activé.")
+                return render(request, 'accounts/login.html')
+            
+            # Also upgrades outdated password hashes
+            if not user.check_password(password):
                 user = None
         
         if user is not None:
-            login(request, user)
+            login(request, user, backend=PROFILE_BACKEND)
             messages.success(request, 'Connexion réussie !')
             return redirect(request.GET.get('next', 'accounts:home'))
         else:
+            # Same signal authenticate() sends, for lockout and audit receivers
+            user_login_failed.send(sender=__name__, credentials={'username': identifier}, request=request)
             messages.error(request, "Nom d'utilisateur/email ou mot de passe incorrect.")
     
     return render(request, 'accounts/login.html')
@@ -111,7 +120,9 @@ def login_view(request):
 def logout_view(request):
     """User logout view."""
     logout(request)
-    messages.info(request, 'Déconnexion réussie')
+    # Programmatic clients never render flash messages; skip the message cookie
+    if request.accepts('text/html'):
+        messages.info(request, 'Déconnexion réussie')
     return redirect('accounts:home')
 
 
@@ -129,9 +140,10 @@ def verify_email_view(request):
         unsigned = signer.unsign(token, max_age=60*60*48)
         if str(unsigned) != str(user_id):
             raise BadSignature('uid mismatch')
-        user = User.objects.get(pk=user_id)
-        user.is_active = True
-        user.save()
+        # Single UPDATE; no row means already verified, or an account deleted since signup
+        activated = User.objects.filter(pk=user_id, is_active=False).update(is_active=True)
+        if not activated and not User.objects.filter(pk=user_id).exists():
+            raise User.DoesNotExist
         messages.success(request, "Votre adresse email a été validée. Vous pouvez vous connecter.")
         return redirect('accounts:login')
     except (User.DoesNotExist, BadSignature, SignatureExpired, ValueError):
@@ -147,43 +159,6 @@ from .adapters.profile_view_adapter import profile_view
 # while maintaining the same interface and behavior
 
 
-def _prepopulate_user_fields(form, user):
-    """Helper function to pre-populate User model fields in the form."""
-    form.fields['first_name'].initial = user.first_name
-    form.fields['last_name'].initial = user.last_name
-    form.fields['email'].initial = user.email
-
-
-def _prepopulate_profile_fields(form, profile):
-    """
-    Helper function to pre-populate Profile model fields in the form.
-    
-    ✅ CORRECTION CRITIQUE : Les champs multi-choice sont toujours initialisés avec une liste
-    (même vide) pour éviter la perte des sélections après sauvegarde.
-    
-    Cette fonction garantit que :
-    1. Les champs multi-choice ont toujours une liste (même vide)
-    2. Les champs simples ont une valeur explicite (même None)
-    3. Les champs texte ont une chaîne explicite (même vide)
-    """
-    # ✅ Single choice fields - toujours assigner une valeur (même None)
-    form.fields['skin_type'].initial = profile.skin_type or None
-    form.fields['age_range'].initial = profile.age_range or None
-    form.fields['product_style'].initial = profile.product_style or None
-    form.fields['routine_frequency'].initial = profile.routine_frequency or None
-    form.fields['budget'].initial = profile.budget or None
-    
-    # ✅ Text fields - toujours assigner une chaîne (même vide)
-    form.fields['dermatological_other'].initial = profile.dermatological_other or ''
-    form.fields['allergies_other'].initial = profile.allergies_other or ''
-    
-    # ✅ Multi-choice fields — toujours assigner une liste (même vide)
-    form.fields['skin_concerns'].initial = profile.get_skin_concerns_list() or []
-    form.fields['dermatological_conditions'].initial = profile.get_dermatological_conditions_list() or []
-    form.fields['allergies'].initial = profile.get_allergies_list() or []
-    form.fields['objectives'].initial = profile.get_objectives_list() or []
-
-
 def _handle_form_errors(form, request):
     """Helper function to handle and display form validation errors."""
     for field_name, errors in form.errors.items():
@@ -218,11 +193,9 @@ def add_allergy_view(request):
 def delete_allergy_view(request, allergy_id):
     """Delete allergy view with improved error handling."""
     try:
-        allergy = Allergy.objects.get(id=allergy_id, user=request.user)
-        allergy_name = allergy.ingredient_name
-        allergy.delete()
-    except Allergy.DoesNotExist:
-        pass
+        # Unknown ids or other users' allergies simply match no rows. The Allergy
+        # post_delete receiver still runs per row to clear the cached allergies.
+        Allergy.objects.filter(id=allergy_id, user=request.user).delete()
     except Exception as e:
         logger.error(f'Error deleting allergy: {str(e)}')
     
@@ -243,30 +216,11 @@ def delete_account(request):
         with transaction.atomic():
             user = request.user
             
-            # Supprimer le profil utilisateur (cela supprimera aussi les allergies)
-            try:
-                profile = UserProfile.objects.get(user=user)
-                profile.delete()
-            except UserProfile.DoesNotExist:
-                pass
-            
-            # Supprimer toutes les données associées à l'utilisateur
-            # Scans
-            from apps.scans.models import Scan
-            Scan.objects.filter(user=user).delete()
-            
-            # Routines IA
-            from apps.ai_routines.models import AIRoutine
-            AIRoutine.objects.filter(user=user).delete()
-            
-            # Messages de chat
-            from apps.ai_routines.models import ChatMessage
-            ChatMessage.objects.filter(user=user).delete()
-            
             # Déconnexion avant suppression
             logout(request)
             
-            # Supprimer l'utilisateur (cela supprimera aussi les allergies via CASCADE)
+            # Supprimer l'utilisateur : profil, allergies, scans et routines
+            # sont supprimés avec lui via on_delete=CASCADE
             user.delete()
             
             messages.success(request, 'Votre compte a été supprimé avec succès. Nous sommes désolés de vous voir partir.')
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-10-18 04:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_routines', '0005_alter_skincondition_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='routine',
+            index=models.Index(fields=['user', 'is_active', '-created_at'], name='routine_user_active_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-18 04:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_routines', '0006_routine_user_active_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userroutinelog',
+            name='rating',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(1, 1), (2, 2), (3, 3), (4, 4), (5, 5)], null=True),
+        ),
+    ]
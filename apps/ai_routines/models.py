@@ -51,6 +51,10 @@ class Routine(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Active routines of a user, newest first (PremiumService.get_user_routines)
+            models.Index(fields=['user', 'is_active', '-created_at'], name='routine_user_active_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.name}"
@@ -59,11 +63,13 @@ class Routine(models.Model):
 class UserRoutineLog(models.Model):
     """Log of user routine usage."""
     
+    RATING_CHOICES = [(i, i) for i in range(1, 6)]
+    
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='routine_logs')
     routine = models.ForeignKey(Routine, on_delete=models.CASCADE, related_name='logs')
     completed_at = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True)
-    rating = models.IntegerField(choices=[(i, i) for i in range(1, 6)], null=True, blank=True)
+    rating = models.PositiveSmallIntegerField(choices=RATING_CHOICES, null=True, blank=True)
     
     class Meta:
         ordering = ['-completed_at']
@@ -6,18 +6,451 @@ This module implements the complete Premium AI service following the specified a
 → [Construction Contexte IA] → [LLM Beauté Personnalisé] → [Sortie JSON formatée] → [Frontend IA UX]
 """
 
+import hashlib
 import json
 import logging
+import re
+import unicodedata
+import uuid
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from types import MappingProxyType
 from typing import Dict, List, Any, Optional, Tuple
 from django.conf import settings
 from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
 from django.contrib.auth.models import User
-from apps.accounts.models import UserProfile, Allergy
+from apps.accounts.models import (
+    UserProfile, Allergy, PROFILE_CACHE_TIMEOUT, allergies_cache_key, premium_context_version_key
+)
 from apps.scans.models import Scan
 
 
 logger = logging.getLogger(__name__)
 
+# Shared decoder for JSON objects embedded in AI responses
+JSON_DECODER = json.JSONDecoder()
+
+# Cached responses are dropped whenever the user's profile, allergies or scans change
+PREMIUM_RESPONSE_TIMEOUT = 600
+
+# Answers from the AI backend are shared across users sending the same prompt for a day
+AI_PROMPT_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Mots-clés indiquant une demande de routine
+ROUTINE_KEYWORDS_RE = re.compile(
+    r"routine|fais-moi|crée|génère|établis|matin|soir|quotidienne|hebdomadaire"
+    r"|étapes|programme|plan|ordonnance|prescription",
+    re.IGNORECASE,
+)
+
+# Contexte requis pour éviter les faux positifs
+ROUTINE_CONTEXT_RE = re.compile(r"routine|soins|matin|soir|quotidien", re.IGNORECASE)
+
+# Mots-clés indiquant une question sur les ingrédients
+INGREDIENT_QUESTION_RE = re.compile(r"ingrédient|composant|substance|formule|acide|vitamine", re.IGNORECASE)
+
+# Type de routine par mot-clé, par ordre de priorité
+ROUTINE_TYPES_BY_KEYWORD = (
+    ('matin', 'morning'),
+    ('soir', 'evening'),
+    ('cheveux', 'hair'),
+    ('corps', 'body'),
+)
+ROUTINE_TYPE_RE = re.compile('|'.join(keyword for keyword, _ in ROUTINE_TYPES_BY_KEYWORD), re.IGNORECASE)
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively make read-only copies: dicts become mappingproxies, lists become tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Comprehensive dermatological knowledge base for RAG integration.
+# Built once per process and shared read-only by every service instance.
+DERMATOLOGICAL_KNOWLEDGE = _freeze({
+    'skin_types': {
+        'dry': {
+            'characteristics': 'Manque d\'hydratation, tiraillements, desquamation',
+            'needs': ['Hydratation intense', 'Barrière lipidique', 'Ingrédients nourrissants', 'Céramides'],
+            'avoid': ['Alcools dénaturés', 'Ingrédients astringents', 'Nettoyants moussants', 'Exfoliants agressifs'],
+            'recommended_ingredients': ['Acide hyaluronique', 'Glycérine', 'Céramides', 'Huiles végétales', 'Beurre de karité'],
+            'routine_focus': 'Hydratation et réparation de la barrière cutanée'
+        },
+        'oily': {
+            'characteristics': 'Production excessive de sébum, brillance, pores dilatés',
+            'needs': ['Régulation du sébum', 'Nettoyage doux', 'Hydratation légère', 'Exfoliation chimique'],
+            'avoid': ['Huiles comédogènes', 'Ingrédients occlusifs', 'Nettoyants agressifs', 'Produits trop riches'],
+            'recommended_ingredients': ['Niacinamide', 'Acide salicylique', 'Zinc', 'Argile', 'Acide glycolique'],
+            'routine_focus': 'Contrôle du sébum et prévention des imperfections'
+        },
+        'sensitive': {
+            'characteristics': 'Réactivité, rougeurs, irritations, picotements',
+            'needs': ['Ingrédients apaisants', 'Formules minimalistes', 'Test patch obligatoire', 'Protection renforcée'],
+            'avoid': ['Parfums', 'Alcools', 'Actifs forts', 'Exfoliants mécaniques', 'Ingrédients irritants'],
+            'recommended_ingredients': ['Centella asiatica', 'Aloe vera', 'Panthenol', 'Acide hyaluronique', 'Thermal water'],
+            'routine_focus': 'Apaisement et renforcement de la barrière cutanée'
+        },
+        'combination': {
+            'characteristics': 'Zones sèches et grasses, T-zone brillante',
+            'needs': ['Équilibre hydratation', 'Produits adaptables', 'Zonage possible', 'Nettoyage équilibré'],
+            'avoid': ['Produits trop riches', 'Produits trop astringents', 'Formules uniformes'],
+            'recommended_ingredients': ['Niacinamide', 'Acide hyaluronique', 'Glycérine', 'Acide lactique'],
+            'routine_focus': 'Équilibre et harmonisation des différentes zones'
+        },
+        'normal': {
+            'characteristics': 'Équilibre naturel, peu de problèmes',
+            'needs': ['Maintien de l\'équilibre', 'Protection préventive', 'Hydratation modérée'],
+            'avoid': ['Produits trop agressifs', 'Surcharge de produits'],
+            'recommended_ingredients': ['Vitamine C', 'Antioxydants', 'Acide hyaluronique', 'Peptides'],
+            'routine_focus': 'Maintien et prévention'
+        }
+    },
+    'age_concerns': {
+        '20s': {
+            'focus': ['Protection solaire', 'Hydratation de base', 'Prévention', 'Antioxydants'],
+            'recommended_actives': ['Vitamine C', 'Niacinamide', 'Acide hyaluronique'],
+            'routine_structure': 'Nettoyant → Sérum → Hydratant → SPF'
+        },
+        '30s': {
+            'focus': ['Antioxydants', 'Rétinol débutant', 'Protection renforcée', 'Prévention rides'],
+            'recommended_actives': ['Rétinol', 'Vitamine C', 'Peptides', 'Acide hyaluronique'],
+            'routine_structure': 'Nettoyant → Sérum → Rétinol → Hydratant → SPF'
+        },
+        '40s': {
+            'focus': ['Peptides', 'Rétinol', 'Hydratation intense', 'Réparation'],
+            'recommended_actives': ['Rétinol', 'Peptides', 'Acide hyaluronique', 'Antioxydants'],
+            'routine_structure': 'Nettoyant → Sérum → Rétinol → Hydratant riche → SPF'
+        },
+        '50s+': {
+            'focus': ['Hydratation maximale', 'Actifs anti-âge', 'Soins réparateurs', 'Protection renforcée'],
+            'recommended_actives': ['Rétinol', 'Peptides', 'Acide hyaluronique', 'Antioxydants', 'Lipides'],
+            'routine_structure': 'Nettoyant doux → Sérum → Rétinol → Crème riche → SPF'
+        }
+    },
+    'ingredient_safety': {
+        'high_risk': ['Parabènes', 'Sulfates', 'Alcools dénaturés', 'Parfums synthétiques'],
+        'moderate_risk': ['Rétinol', 'Acides de fruits', 'Vitamine C instable'],
+        'safe': ['Acide hyaluronique', 'Glycérine', 'Niacinamide', 'Céramides', 'Panthenol'],
+        'allergenic': ['Lanoline', 'Parfums', 'Conservateurs', 'Colorants']
+    },
+    'common_ingredients_info': {
+        'acide hyaluronique': {
+            'description': 'Hydratant puissant qui retient l\'eau dans la peau',
+            'benefits': ['Hydratation intense', 'Anti-rides', 'Plénitude'],
+            'risks': ['Peut causer des irritations chez les peaux très sensibles'],
+            'best_for': ['Tous types de peau', 'Peau sèche', 'Anti-âge'],
+            'avoid_if': ['Allergie connue à l\'acide hyaluronique']
+        },
+        'rétinol': {
+            'description': 'Vitamine A dérivée, actif anti-âge puissant',
+            'benefits': ['Anti-rides', 'Régénération cellulaire', 'Uniformisation du teint'],
+            'risks': ['Irritation', 'Sensibilité au soleil', 'Desquamation'],
+            'best_for': ['Peau mature', 'Acné', 'Taches pigmentaires'],
+            'avoid_if': ['Peau très sensible', 'Grossesse', 'Allaitement']
+        },
+        'vitamine c': {
+            'description': 'Antioxydant puissant qui protège et éclaircit la peau',
+            'benefits': ['Protection antioxydante', 'Éclaircissement', 'Stimulation du collagène'],
+            'risks': ['Instabilité à la lumière', 'Peut irriter les peaux sensibles'],
+            'best_for': ['Tous types de peau', 'Anti-âge', 'Taches pigmentaires'],
+            'avoid_if': ['Peau très sensible', 'Allergie à la vitamine C']
+        },
+        'niacinamide': {
+            'description': 'Vitamine B3 qui régule le sébum et améliore la texture',
+            'benefits': ['Régulation du sébum', 'Réduction des pores', 'Anti-inflammatoire'],
+            'risks': ['Rarement, légère irritation'],
+            'best_for': ['Peau grasse', 'Peau mixte', 'Acné'],
+            'avoid_if': ['Allergie à la niacinamide']
+        }
+    },
+    'recommended_ingredients_list': [
+        'Acide hyaluronique', 'Glycérine', 'Niacinamide', 'Céramides', 'Panthenol',
+        'Vitamine C', 'Rétinol', 'Peptides', 'Acide salicylique', 'Acide glycolique',
+        'Centella asiatica', 'Aloe vera', 'Thermal water', 'Huiles végétales'
+    ]
+})
+
+# Internal product database with scores and prices (read-only, shared)
+PRODUCT_DATABASE = _freeze((
+    # Nettoyants
+    {
+        'name': 'Gel nettoyant doux',
+        'brand': 'CeraVe',
+        'type': 'nettoyant',
+        'price': 12.99,
+        'score': 85,
+        'ingredients': ['Céramides', 'Acide hyaluronique', 'Niacinamide'],
+        'skin_types': ['dry', 'sensitive', 'normal'],
+        'size': '236ml',
+        'description': 'Nettoyant doux sans savon, adapté à tous types de peau'
+    },
+    {
+        'name': 'Gel nettoyant moussant',
+        'brand': 'La Roche-Posay',
+        'type': 'nettoyant',
+        'price': 15.99,
+        'score': 88,
+        'ingredients': ['Thermal water', 'Niacinamide', 'Zinc'],
+        'skin_types': ['oily', 'combination', 'normal'],
+        'size': '200ml',
+        'description': 'Nettoyant moussant pour peau mixte à grasse'
+    },
+    # Sérums
+    {
+        'name': 'Sérum Niacinamide 10%',
+        'brand': 'The Ordinary',
+        'type': 'sérum',
+        'price': 8.99,
+        'score': 90,
+        'ingredients': ['Niacinamide', 'Zinc'],
+        'skin_types': ['oily', 'combination', 'normal'],
+        'size': '30ml',
+        'description': 'Sérum régulateur de sébum et anti-imperfections'
+    },
+    {
+        'name': 'Sérum Acide Hyaluronique',
+        'brand': 'The Ordinary',
+        'type': 'sérum',
+        'price': 7.99,
+        'score': 92,
+        'ingredients': ['Acide hyaluronique', 'Vitamine B5'],
+        'skin_types': ['all'],
+        'size': '30ml',
+        'description': 'Hydratation intense et réparatrice'
+    },
+    # Hydratants
+    {
+        'name': 'Crème hydratante',
+        'brand': 'La Roche-Posay',
+        'type': 'hydratant',
+        'price': 18.99,
+        'score': 90,
+        'ingredients': ['Acide hyaluronique', 'Glycérine', 'Thermal water'],
+        'skin_types': ['dry', 'sensitive', 'normal'],
+        'size': '50ml',
+        'description': 'Hydratation intense et apaisante'
+    },
+    {
+        'name': 'Gel hydratant',
+        'brand': 'Neutrogena',
+        'type': 'hydratant',
+        'price': 14.99,
+        'score': 85,
+        'ingredients': ['Acide hyaluronique', 'Glycérine'],
+        'skin_types': ['oily', 'combination', 'normal'],
+        'size': '50ml',
+        'description': 'Hydratation légère sans effet gras'
+    },
+    # SPF
+    {
+        'name': 'Anthelios UVMune 400',
+        'brand': 'La Roche-Posay',
+        'type': 'SPF',
+        'price': 22.99,
+        'score': 92,
+        'ingredients': ['Mexoryl 400', 'Mexoryl SX', 'Mexoryl XL'],
+        'skin_types': ['all'],
+        'size': '50ml',
+        'description': 'Protection solaire large spectre invisible'
+    },
+    {
+        'name': 'SPF 50+ Invisible',
+        'brand': 'CeraVe',
+        'type': 'SPF',
+        'price': 19.99,
+        'score': 88,
+        'ingredients': ['Zinc oxide', 'Titanium dioxide', 'Céramides'],
+        'skin_types': ['all'],
+        'size': '50ml',
+        'description': 'Protection minérale adaptée aux peaux sensibles'
+    },
+    # Actifs
+    {
+        'name': 'Rétinol 0.5%',
+        'brand': 'The Ordinary',
+        'type': 'actif',
+        'price': 9.99,
+        'score': 85,
+        'ingredients': ['Rétinol', 'Squalane'],
+        'skin_types': ['normal', 'combination', 'dry'],
+        'size': '30ml',
+        'description': 'Actif anti-âge pour débutants'
+    },
+    {
+        'name': 'Vitamine C 23%',
+        'brand': 'The Ordinary',
+        'type': 'actif',
+        'price': 11.99,
+        'score': 87,
+        'ingredients': ['Vitamine C', 'Acide hyaluronique'],
+        'skin_types': ['all'],
+        'size': '30ml',
+        'description': 'Antioxydant et éclaircissant'
+    }
+))
+
+
+def fold_accents(text: str) -> str:
+    """Lower-case a text and strip its accents ("Rétinol" -> "retinol")."""
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode().lower()
+
+
+# Separators found in scanned ingredient lists ("A, B", "A,B", "A; B")
+INGREDIENT_SEPARATOR_RE = re.compile(r'\s*[,;]\s*')
+
+
+def split_ingredients(ingredients_text: str) -> List[str]:
+    """Split a scanned ingredient list into names, dropping empty entries."""
+    if not ingredients_text:
+        return []
+    return [ingredient for ingredient in INGREDIENT_SEPARATOR_RE.split(ingredients_text.strip()) if ingredient]
+
+
+# Common ingredient keywords as (accent-folded, canonical) pairs, in priority order
+INGREDIENT_KEYWORDS = tuple(
+    (fold_accents(keyword), keyword)
+    for keyword in (
+        'acide hyaluronique', 'rétinol', 'vitamine c', 'niacinamide', 'peptides',
+        'acide salicylique', 'acide glycolique', 'acide lactique', 'collagène',
+        'élastine', 'céramides', 'acides gras', 'antioxydants', 'spf'
+    )
+)
+
+# Seasonal skincare factors, selected by the current month
+SEASONAL_RECOMMENDATIONS = _freeze({
+    'summer': ['SPF renforcé', 'Hydratation légère', 'Protection contre la chaleur'],
+    'winter': ['Hydratation intense', 'Barrière lipidique', 'Protection contre le froid'],
+    'spring': ['Exfoliation douce', 'Antioxydants', 'Préparation pour l\'été'],
+    'autumn': ['Réparation', 'Hydratation modérée', 'Préparation pour l\'hiver']
+})
+
+SEASONAL_FACTORS = MappingProxyType({
+    'summer': MappingProxyType({
+        'season': 'été',
+        'humidity': 'modérée',
+        'temperature': 'chaude',
+        'uv_index': 'élevé',
+        'recommendations': SEASONAL_RECOMMENDATIONS
+    }),
+    'autumn': MappingProxyType({
+        'season': 'automne',
+        'humidity': 'élevée',
+        'temperature': 'fraîche',
+        'uv_index': 'modéré',
+        'recommendations': SEASONAL_RECOMMENDATIONS
+    }),
+    'winter': MappingProxyType({
+        'season': 'hiver',
+        'humidity': 'faible',
+        'temperature': 'froide',
+        'uv_index': 'faible',
+        'recommendations': SEASONAL_RECOMMENDATIONS
+    }),
+    'spring': MappingProxyType({
+        'season': 'printemps',
+        'humidity': 'modérée',
+        'temperature': 'douce',
+        'uv_index': 'modéré',
+        'recommendations': SEASONAL_RECOMMENDATIONS
+    })
+})
+
+# Season of each month, January first
+SEASON_BY_MONTH = (
+    'winter', 'winter', 'spring', 'spring', 'spring', 'summer',
+    'summer', 'summer', 'autumn', 'autumn', 'autumn', 'winter'
+)
+
+# Shared read-only fallback for skin types and age ranges missing from the knowledge base
+EMPTY_KNOWLEDGE = MappingProxyType({})
+
+# Field extractor for the allergy dicts built by _get_user_allergies
+_allergy_ingredient = itemgetter('ingredient')
+
+
+@lru_cache(maxsize=32)
+def _static_skin_bundle(skin_type: str, age_range: str) -> Tuple[Tuple[str, ...], Dict[str, Any], Dict[str, Any]]:
+    """Get the top 3 knowledge-base needs and the knowledge for a skin type and age range."""
+    skin_knowledge = DERMATOLOGICAL_KNOWLEDGE['skin_types'].get(skin_type, EMPTY_KNOWLEDGE)
+    age_knowledge = DERMATOLOGICAL_KNOWLEDGE['age_concerns'].get(age_range, EMPTY_KNOWLEDGE)
+    needs = (*skin_knowledge.get('needs', ()), *age_knowledge.get('focus', ()))
+    return needs[:3], skin_knowledge, age_knowledge
+
+
+def _profile_text(value: Any, default: str) -> Any:
+    """Join a list profile value for display, or fall back to default when empty."""
+    if isinstance(value, list):
+        return ", ".join(value) if value else default
+    return value or default
+
+
+def _primary_skin_type(value: Any, default: Optional[str]) -> Optional[str]:
+    """Return the first skin type of a list profile value, or default when empty."""
+    if isinstance(value, list):
+        return value[0] if value else default
+    return value or default
+
+
+@lru_cache(maxsize=256)
+def _routine_prompt(
+    routine_type: str,
+    skin_type: str,
+    skin_concerns: str,
+    age_range: str,
+    budget_text: str,
+    pathologies: str,
+    context_info: str
+) -> str:
+    """Build the routine generation prompt from already formatted profile values."""
+    return f"""
+        Créez une routine de soins {routine_type} personnalisée en français avec les spécifications suivantes:
+        
+        Profil utilisateur:
+        - Type de peau: {skin_type}
+        - Préoccupations: {skin_concerns}
+        - Âge: {age_range}
+        - Budget: {budget_text}
+        - Pathologies: {pathologies}{context_info}
+        
+        Format de réponse JSON requis:
+        {{
+            "routine": {{
+                "matin": [
+                    {{
+                        "type": "nettoyant",
+                        "produit": "Nom du produit",
+                        "marque": "Marque",
+                        "prix": 15.99,
+                        "score": 85,
+                        "explication": "Pourquoi ce produit est recommandé"
+                    }}
+                ],
+                "soir": [
+                    {{
+                        "type": "démaquillant",
+                        "produit": "Nom du produit",
+                        "marque": "Marque",
+                        "prix": 12.99,
+                        "score": 88,
+                        "explication": "Pourquoi ce produit est recommandé"
+                    }}
+                ]
+            }},
+            "explication_globale": "Explication des besoins de la peau",
+            "conseils": ["Conseil 1", "Conseil 2"]
+        }}
+        
+        Assurez-vous que tous les produits sont adaptés au type de peau et au budget.
+        Incluez des explications sur les besoins spécifiques de la peau.
+        """
+
 
 class PremiumAIService:
     """
@@ -46,247 +479,12 @@ class PremiumAIService:
             "Alternatives budget friendly"
         ]
         
-        # Base de connaissances dermatologiques
-        self.dermatological_knowledge = self._initialize_dermatological_knowledge()
-        
-        # Base de produits internes avec scores
-        self.internal_product_database = self._initialize_product_database()
-    
-    def _initialize_dermatological_knowledge(self) -> Dict[str, Any]:
-        """
-        Initialize comprehensive dermatological knowledge base for RAG integration.
+        # Base de connaissances dermatologiques (partagée, construite une fois)
+        self.dermatological_knowledge = DERMATOLOGICAL_KNOWLEDGE
         
-        Returns:
-            Dict containing structured dermatological knowledge
-        """
-        return {
-            'skin_types': {
-                'dry': {
-                    'characteristics': 'Manque d\'hydratation, tiraillements, desquamation',
-                    'needs': ['Hydratation intense', 'Barrière lipidique', 'Ingrédients nourrissants', 'Céramides'],
-                    'avoid': ['Alcools dénaturés', 'Ingrédients astringents', 'Nettoyants moussants', 'Exfoliants agressifs'],
-                    'recommended_ingredients': ['Acide hyaluronique', 'Glycérine', 'Céramides', 'Huiles végétales', 'Beurre de karité'],
-                    'routine_focus': 'Hydratation et réparation de la barrière cutanée'
-                },
-                'oily': {
-                    'characteristics': 'Production excessive de sébum, brillance, pores dilatés',
-                    'needs': ['Régulation du sébum', 'Nettoyage doux', 'Hydratation légère', 'Exfoliation chimique'],
-                    'avoid': ['Huiles comédogènes', 'Ingrédients occlusifs', 'Nettoyants agressifs', 'Produits trop riches'],
-                    'recommended_ingredients': ['Niacinamide', 'Acide salicylique', 'Zinc', 'Argile', 'Acide glycolique'],
-                    'routine_focus': 'Contrôle du sébum et prévention des imperfections'
-                },
-                'sensitive': {
-                    'characteristics': 'Réactivité, rougeurs, irritations, picotements',
-                    'needs': ['Ingrédients apaisants', 'Formules minimalistes', 'Test patch obligatoire', 'Protection renforcée'],
-                    'avoid': ['Parfums', 'Alcools', 'Actifs forts', 'Exfoliants mécaniques', 'Ingrédients irritants'],
-                    'recommended_ingredients': ['Centella asiatica', 'Aloe vera', 'Panthenol', 'Acide hyaluronique', 'Thermal water'],
-                    'routine_focus': 'Apaisement et renforcement de la barrière cutanée'
-                },
-                'combination': {
-                    'characteristics': 'Zones sèches et grasses, T-zone brillante',
-                    'needs': ['Équilibre hydratation', 'Produits adaptables', 'Zonage possible', 'Nettoyage équilibré'],
-                    'avoid': ['Produits trop riches', 'Produits trop astringents', 'Formules uniformes'],
-                    'recommended_ingredients': ['Niacinamide', 'Acide hyaluronique', 'Glycérine', 'Acide lactique'],
-                    'routine_focus': 'Équilibre et harmonisation des différentes zones'
-                },
-                'normal': {
-                    'characteristics': 'Équilibre naturel, peu de problèmes',
-                    'needs': ['Maintien de l\'équilibre', 'Protection préventive', 'Hydratation modérée'],
-                    'avoid': ['Produits trop agressifs', 'Surcharge de produits'],
-                    'recommended_ingredients': ['Vitamine C', 'Antioxydants', 'Acide hyaluronique', 'Peptides'],
-                    'routine_focus': 'Maintien et prévention'
-                }
-            },
-            'age_concerns': {
-                '20s': {
-                    'focus': ['Protection solaire', 'Hydratation de base', 'Prévention', 'Antioxydants'],
-                    'recommended_actives': ['Vitamine C', 'Niacinamide', 'Acide hyaluronique'],
-                    'routine_structure': 'Nettoyant → Sérum → Hydratant → SPF'
-                },
-                '30s': {
-                    'focus': ['Antioxydants', 'Rétinol débutant', 'Protection renforcée', 'Prévention rides'],
-                    'recommended_actives': ['Rétinol', 'Vitamine C', 'Peptides', 'Acide hyaluronique'],
-                    'routine_structure': 'Nettoyant → Sérum → Rétinol → Hydratant → SPF'
-                },
-                '40s': {
-                    'focus': ['Peptides', 'Rétinol', 'Hydratation intense', 'Réparation'],
-                    'recommended_actives': ['Rétinol', 'Peptides', 'Acide hyaluronique', 'Antioxydants'],
-                    'routine_structure': 'Nettoyant → Sérum → Rétinol → Hydratant riche → SPF'
-                },
-                '50s+': {
-                    'focus': ['Hydratation maximale', 'Actifs anti-âge', 'Soins réparateurs', 'Protection renforcée'],
-                    'recommended_actives': ['Rétinol', 'Peptides', 'Acide hyaluronique', 'Antioxydants', 'Lipides'],
-                    'routine_structure': 'Nettoyant doux → Sérum → Rétinol → Crème riche → SPF'
-                }
-            },
-            'ingredient_safety': {
-                'high_risk': ['Parabènes', 'Sulfates', 'Alcools dénaturés', 'Parfums synthétiques'],
-                'moderate_risk': ['Rétinol', 'Acides de fruits', 'Vitamine C instable'],
-                'safe': ['Acide hyaluronique', 'Glycérine', 'Niacinamide', 'Céramides', 'Panthenol'],
-                'allergenic': ['Lanoline', 'Parfums', 'Conservateurs', 'Colorants']
-            },
-            'common_ingredients_info': {
-                'acide hyaluronique': {
-                    'description': 'Hydratant puissant qui retient l\'eau dans la peau',
-                    'benefits': ['Hydratation intense', 'Anti-rides', 'Plénitude'],
-                    'risks': ['Peut causer des irritations chez les peaux très sensibles'],
-                    'best_for': ['Tous types de peau', 'Peau sèche', 'Anti-âge'],
-                    'avoid_if': ['Allergie connue à l\'acide hyaluronique']
-                },
-                'rétinol': {
-                    'description': 'Vitamine A dérivée, actif anti-âge puissant',
-                    'benefits': ['Anti-rides', 'Régénération cellulaire', 'Uniformisation du teint'],
-                    'risks': ['Irritation', 'Sensibilité au soleil', 'Desquamation'],
-                    'best_for': ['Peau mature', 'Acné', 'Taches pigmentaires'],
-                    'avoid_if': ['Peau très sensible', 'Grossesse', 'Allaitement']
-                },
-                'vitamine c': {
-                    'description': 'Antioxydant puissant qui protège et éclaircit la peau',
-                    'benefits': ['Protection antioxydante', 'Éclaircissement', 'Stimulation du collagène'],
-                    'risks': ['Instabilité à la lumière', 'Peut irriter les peaux sensibles'],
-                    'best_for': ['Tous types de peau', 'Anti-âge', 'Taches pigmentaires'],
-                    'avoid_if': ['Peau très sensible', 'Allergie à la vitamine C']
-                },
-                'niacinamide': {
-                    'description': 'Vitamine B3 qui régule le sébum et améliore la texture',
-                    'benefits': ['Régulation du sébum', 'Réduction des pores', 'Anti-inflammatoire'],
-                    'risks': ['Rarement, légère irritation'],
-                    'best_for': ['Peau grasse', 'Peau mixte', 'Acné'],
-                    'avoid_if': ['Allergie à la niacinamide']
-                }
-            },
-            'recommended_ingredients_list': [
-                'Acide hyaluronique', 'Glycérine', 'Niacinamide', 'Céramides', 'Panthenol',
-                'Vitamine C', 'Rétinol', 'Peptides', 'Acide salicylique', 'Acide glycolique',
-                'Centella asiatica', 'Aloe vera', 'Thermal water', 'Huiles végétales'
-            ]
-        }
+        # Base de produits internes avec scores (partagée, construite une fois)
+        self.internal_product_database = PRODUCT_DATABASE
     
-    def _initialize_product_database(self) -> List[Dict[str, Any]]:
-        """
-        Initialize internal product database with scores and prices.
-        
-        Returns:
-            List of product dictionaries with comprehensive information
-        """
-        return [
-            # Nettoyants
-            {
-                'name': 'Gel nettoyant doux',
-                'brand': 'CeraVe',
-                'type': 'nettoyant',
-                'price': 12.99,
-                'score': 85,
-                'ingredients': ['Céramides', 'Acide hyaluronique', 'Niacinamide'],
-                'skin_types': ['dry', 'sensitive', 'normal'],
-                'size': '236ml',
-                'description': 'Nettoyant doux sans savon, adapté à tous types de peau'
-            },
-            {
-                'name': 'Gel nettoyant moussant',
-                'brand': 'La Roche-Posay',
-                'type': 'nettoyant',
-                'price': 15.99,
-                'score': 88,
-                'ingredients': ['Thermal water', 'Niacinamide', 'Zinc'],
-                'skin_types': ['oily', 'combination', 'normal'],
-                'size': '200ml',
-                'description': 'Nettoyant moussant pour peau mixte à grasse'
-            },
-            # Sérums
-            {
-                'name': 'Sérum Niacinamide 10%',
-                'brand': 'The Ordinary',
-                'type': 'sérum',
-                'price': 8.99,
-                'score': 90,
-                'ingredients': ['Niacinamide', 'Zinc'],
-                'skin_types': ['oily', 'combination', 'normal'],
-                'size': '30ml',
-                'description': 'Sérum régulateur de sébum et anti-imperfections'
-            },
-            {
-                'name': 'Sérum Acide Hyaluronique',
-                'brand': 'The Ordinary',
-                'type': 'sérum',
-                'price': 7.99,
-                'score': 92,
-                'ingredients': ['Acide hyaluronique', 'Vitamine B5'],
-                'skin_types': ['all'],
-                'size': '30ml',
-                'description': 'Hydratation intense et réparatrice'
-            },
-            # Hydratants
-            {
-                'name': 'Crème hydratante',
-                'brand': 'La Roche-Posay',
-                'type': 'hydratant',
-                'price': 18.99,
-                'score': 90,
-                'ingredients': ['Acide hyaluronique', 'Glycérine', 'Thermal water'],
-                'skin_types': ['dry', 'sensitive', 'normal'],
-                'size': '50ml',
-                'description': 'Hydratation intense et apaisante'
-            },
-            {
-                'name': 'Gel hydratant',
-                'brand': 'Neutrogena',
-                'type': 'hydratant',
-                'price': 14.99,
-                'score': 85,
-                'ingredients': ['Acide hyaluronique', 'Glycérine'],
-                'skin_types': ['oily', 'combination', 'normal'],
-                'size': '50ml',
-                'description': 'Hydratation légère sans effet gras'
-            },
-            # SPF
-            {
-                'name': 'Anthelios UVMune 400',
-                'brand': 'La Roche-Posay',
-                'type': 'SPF',
-                'price': 22.99,
-                'score': 92,
-                'ingredients': ['Mexoryl 400', 'Mexoryl SX', 'Mexoryl XL'],
-                'skin_types': ['all'],
-                'size': '50ml',
-                'description': 'Protection solaire large spectre invisible'
-            },
-            {
-                'name': 'SPF 50+ Invisible',
-                'brand': 'CeraVe',
-                'type': 'SPF',
-                'price': 19.99,
-                'score': 88,
-                'ingredients': ['Zinc oxide', 'Titanium dioxide', 'Céramides'],
-                'skin_types': ['all'],
-                'size': '50ml',
-                'description': 'Protection minérale adaptée aux peaux sensibles'
-            },
-            # Actifs
-            {
-                'name': 'Rétinol 0.5%',
-                'brand': 'The Ordinary',
-                'type': 'actif',
-                'price': 9.99,
-                'score': 85,
-                'ingredients': ['Rétinol', 'Squalane'],
-                'skin_types': ['normal', 'combination', 'dry'],
-                'size': '30ml',
-                'description': 'Actif anti-âge pour débutants'
-            },
-            {
-                'name': 'Vitamine C 23%',
-                'brand': 'The Ordinary',
-                'type': 'actif',
-                'price': 11.99,
-                'score': 87,
-                'ingredients': ['Vitamine C', 'Acide hyaluronique'],
-                'skin_types': ['all'],
-                'size': '30ml',
-                'description': 'Antioxydant et éclaircissant'
-            }
-        ]
-        
     def process_premium_request(
         self, 
         user: User, 
@@ -306,30 +504,36 @@ class PremiumAIService:
         Returns:
             Dictionary containing structured response with routine, explanations, and recommendations
         """
+        cache_key = self._response_cache_key(user, question, context_product_id, budget_filter)
+        response = cache.get(cache_key)
+        if response is not None:
+            # Only the answer is reused, its timestamp is the current one
+            if 'timestamp' in response:
+                response['timestamp'] = self._get_current_timestamp()
+            return response
+        
         try:
             # Get user profile and context
             user_profile = self._get_user_profile(user)
             context_data = self._build_context(user, user_profile, context_product_id)
             
-            # Generate AI response based on question type
+            # Pick the AI response generator based on question type
             if self._is_routine_request(question):
-                try:
-                    response = self._generate_routine_response(user_profile, question, budget_filter, context_data)
-                except Exception as routine_error:
-                    logger.error(f"Error in routine generation: {str(routine_error)}")
-                    response = self._generate_error_response(f"Erreur routine: {str(routine_error)}")
+                error_label = 'routine'
+                generate, args = self._generate_routine_response, (user_profile, question, budget_filter, context_data)
             elif self._is_ingredient_question(question):
-                try:
-                    response = self._generate_ingredient_response(question, context_data)
-                except Exception as ingredient_error:
-                    logger.error(f"Error in ingredient analysis: {str(ingredient_error)}")
-                    response = self._generate_error_response(f"Erreur ingrédient: {str(ingredient_error)}")
+                error_label = 'ingrédient'
+                generate, args = self._generate_ingredient_response, (question, context_data)
             else:
-                try:
-                    response = self._generate_general_response(question, context_data)
-                except Exception as general_error:
-                    logger.error(f"Error in general response: {str(general_error)}")
-                    response = self._generate_error_response(f"Erreur générale: {str(general_error)}")
+                error_label = 'générale'
+                generate, args = self._generate_general_response, (question, context_data)
+            
+            # A failing generator still gets the common elements below
+            try:
+                response = generate(*args)
+            except Exception as generation_error:
+                logger.exception("Error generating %s response", error_label)
+                response = self._generate_error_response(f"Erreur {error_label}: {generation_error}")
             
             # Add common elements
             response.update({
@@ -338,16 +542,44 @@ class PremiumAIService:
                 'alerts': self._generate_alerts(user_profile, context_data)
             })
             
+            # Errors and canned fallback answers are retried on the next request
+            if response.get('type') != 'error' and not response.get('fallback'):
+                cache.set(cache_key, response, PREMIUM_RESPONSE_TIMEOUT)
             return response
             
         except Exception as e:
-            logger.error(f"Error processing Premium request: {str(e)}")
+            logger.exception("Error processing Premium request")
             return self._generate_error_response(str(e))
     
+    def _response_cache_key(
+        self,
+        user: User,
+        question: str,
+        context_product_id: Optional[int],
+        budget_filter: Optional[float]
+    ) -> str:
+        """
+        Build the cache key of a Premium response.
+        
+        The key embeds a per-user version token which the profile, allergy and
+        scan signals delete, so any change to the context yields new keys. The
+        exact budget is kept since it changes which products are recommended,
+        and the season since it is part of the context.
+        """
+        version = cache.get_or_set(premium_context_version_key(user.id), lambda: uuid.uuid4().hex, None)
+        season = SEASON_BY_MONTH[timezone.localdate().month - 1]
+        normalized_question = ' '.join(question.lower().split())
+        question_hash = hashlib.blake2b(normalized_question.encode(), digest_size=16).hexdigest()
+        return f'premium_response_{user.id}_{version}_{season}_{context_product_id}_{budget_filter}_{question_hash}'
+    
     def _get_user_profile(self, user: User) -> UserProfile:
         """Get or create user profile with all skincare preferences."""
-        profile, created = UserProfile.objects.get_or_create(user=user)
-        return profile
+        try:
+            # Already loaded with the session user by ProfileModelBackend
+            return user.profile
+        except UserProfile.DoesNotExist:
+            profile, created = UserProfile.objects.get_or_create(user=user)
+            return profile
     
     def _build_context(
         self, 
@@ -383,8 +615,9 @@ class PremiumAIService:
                 'pathologies': profile.pathologies
         }
         
-        # Get user allergies
+        # Get user allergies, with their names extracted once for every consumer
         allergies = self._get_user_allergies(user)
+        allergy_names = tuple(map(_allergy_ingredient, allergies))
         
         # Get recent scan history
         scan_history = self._get_recent_scans(user)
@@ -398,13 +631,14 @@ class PremiumAIService:
         context = {
             'user_profile': user_profile_data,
             'allergies': allergies,
+            'allergy_names': allergy_names,
             'scan_history': scan_history,
             'product_context': product_context,
             'dermatological_knowledge': self.dermatological_knowledge,
             'internal_product_database': self.internal_product_database,
             'user_preferences': self._get_user_preferences(user),
             'seasonal_factors': self._get_seasonal_factors(),
-            'skin_analysis': self._analyze_skin_needs(user_profile_data, allergies, scan_history)
+            'skin_analysis': self._analyze_skin_needs(user_profile_data, allergy_names, scan_history)
         }
             
         return context
@@ -436,25 +670,13 @@ class PremiumAIService:
         Returns:
             Dict containing seasonal information
         """
-        # This would typically use current date and location
-        # For now, returning general seasonal factors
-        return {
-            'season': 'été',  # Would be calculated based on date
-            'humidity': 'modérée',
-            'temperature': 'chaude',
-            'uv_index': 'élevé',
-            'recommendations': {
-                'summer': ['SPF renforcé', 'Hydratation légère', 'Protection contre la chaleur'],
-                'winter': ['Hydratation intense', 'Barrière lipidique', 'Protection contre le froid'],
-                'spring': ['Exfoliation douce', 'Antioxydants', 'Préparation pour l\'été'],
-                'autumn': ['Réparation', 'Hydratation modérée', 'Préparation pour l\'hiver']
-            }
-        }
+        # Location is not known, seasons follow the northern hemisphere calendar
+        return SEASONAL_FACTORS[SEASON_BY_MONTH[timezone.localdate().month - 1]]
     
     def _analyze_skin_needs(
         self, 
         user_profile: Dict[str, Any], 
-        allergies: List[Dict[str, str]], 
+        allergy_names: Tuple[str, ...], 
         scan_history: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """
@@ -462,43 +684,38 @@ class PremiumAIService:
         
         Args:
             user_profile: User profile data
-            allergies: User allergies
+            allergy_names: Ingredient names of the user allergies
             scan_history: Recent scan history
             
         Returns:
             Dict containing analyzed skin needs
         """
-        skin_type = user_profile.get('skin_type', 'normal')
-        concerns = user_profile.get('skin_concerns', [])
-        age_range = user_profile.get('age_range', '20s')
+        get_profile_value = user_profile.get
+        skin_type = get_profile_value('skin_type', 'normal')
+        concerns = get_profile_value('skin_concerns', [])
+        age_range = get_profile_value('age_range', '20s')
         
-        # Get dermatological knowledge for skin type
-        skin_knowledge = self.dermatological_knowledge['skin_types'].get(skin_type, {})
-        age_knowledge = self.dermatological_knowledge['age_concerns'].get(age_range, {})
+        # Get dermatological knowledge for skin type and age (memoized per pair)
+        static_needs, skin_knowledge, age_knowledge = _static_skin_bundle(skin_type, age_range)
+        get_skin_value = skin_knowledge.get
         
         # Analyze scan history for patterns
         scan_analysis = self._analyze_scan_history(scan_history)
         
-        # Determine priority needs
-        priority_needs = []
-        if skin_knowledge:
-            priority_needs.extend(skin_knowledge.get('needs', []))
-        if age_knowledge:
-            priority_needs.extend(age_knowledge.get('focus', []))
-        
-        # Add concerns-specific needs
-        if concerns:
-            priority_needs.extend(concerns)
+        # Top 3 needs: knowledge base first, then concerns-specific needs
+        priority_needs = list(static_needs)
+        if concerns and len(priority_needs) < 3:
+            priority_needs.extend(concerns[:3 - len(priority_needs)])
         
         return {
-            'primary_needs': priority_needs[:3],  # Top 3 needs
-            'skin_characteristics': skin_knowledge.get('characteristics', ''),
-            'recommended_ingredients': skin_knowledge.get('recommended_ingredients', []),
-            'avoided_ingredients': skin_knowledge.get('avoid', []),
-            'routine_focus': skin_knowledge.get('routine_focus', ''),
+            'primary_needs': priority_needs,
+            'skin_characteristics': get_skin_value('characteristics', ''),
+            'recommended_ingredients': get_skin_value('recommended_ingredients', []),
+            'avoided_ingredients': get_skin_value('avoid', []),
+            'routine_focus': get_skin_value('routine_focus', ''),
             'age_focus': age_knowledge.get('focus', []),
             'scan_analysis': scan_analysis,
-            'allergy_risks': [allergy['ingredient'] for allergy in allergies]
+            'allergy_risks': list(allergy_names)
         }
     
     def _analyze_scan_history(self, scan_history: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -521,27 +738,18 @@ class PremiumAIService:
             }
         
         total_scans = len(scan_history)
-        scores = [scan.get('score', 0) for scan in scan_history if scan.get('score') is not None]
+        scores = [scan['score'] for scan in scan_history if scan.get('score') is not None]
         average_score = sum(scores) / len(scores) if scores else 0
         
-        # Extract common ingredients
-        all_ingredients = []
-        for scan in scan_history:
-            ingredients = scan.get('ingredients', [])
-            all_ingredients.extend(ingredients)
-        
-        # Count ingredient frequency
-        ingredient_counts = {}
-        for ingredient in all_ingredients:
-            ingredient_counts[ingredient] = ingredient_counts.get(ingredient, 0) + 1
-        
-        common_ingredients = sorted(ingredient_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+        # Count ingredient frequency across all scans
+        ingredient_counts = Counter(chain.from_iterable(scan.get('ingredients', ()) for scan in scan_history))
+        common_ingredients = ingredient_counts.most_common(5)
         
         # Identify risk patterns
-        low_score_products = [scan for scan in scan_history if scan.get('score') is not None and scan.get('score', 100) < 50]
+        low_score_count = sum(1 for score in scores if score < 50)
         risk_patterns = []
-        if low_score_products:
-            risk_patterns.append(f"{len(low_score_products)} produits avec score faible détectés")
+        if low_score_count:
+            risk_patterns.append(f"{low_score_count} produits avec score faible détectés")
         
         return {
             'total_scans': total_scans,
@@ -584,28 +792,30 @@ class PremiumAIService:
     
     def _get_user_allergies(self, user: User) -> List[Dict[str, str]]:
         """Get user's allergies and sensitivities."""
-        allergies = Allergy.objects.filter(user=user)
-        return [
-            {
-                'ingredient': allergy.ingredient_name,
-                'severity': allergy.severity,
-                'notes': allergy.notes
-            }
-            for allergy in allergies
-        ]
+        def load_allergies():
+            # Dicts straight from the cursor, no Allergy instances built
+            return list(Allergy.objects.filter(user_id=user.id).values(
+                'severity', 'notes', ingredient=F('ingredient_name')
+            ))
+        
+        # Invalidated by the Allergy post_save/post_delete signals
+        return cache.get_or_set(allergies_cache_key(user.id), load_allergies, PROFILE_CACHE_TIMEOUT)
     
     def _get_recent_scans(self, user: User, limit: int = 5) -> List[Dict[str, Any]]:
         """Get user's recent scan history for context."""
         try:
-            scans = Scan.objects.filter(user=user).order_by('-scanned_at')[:limit]
+            # Plain tuples from the cursor, no Scan instances built
+            rows = Scan.objects.filter(user_id=user.id).order_by('-scanned_at').values_list(
+                'product_name', 'product_score', 'product_ingredients_text', 'scanned_at'
+            )[:limit]
             return [
                 {
-                    'product_name': getattr(scan, 'product_name', None) or 'Produit inconnu',
-                    'score': getattr(scan, 'product_score', None),
-                    'ingredients': getattr(scan, 'product_ingredients_text', '').split(', ') if getattr(scan, 'product_ingredients_text', None) else [],
-                    'created_at': scan.scanned_at.isoformat()
+                    'product_name': product_name or 'Produit inconnu',
+                    'score': product_score,
+                    'ingredients': split_ingredients(ingredients_text),
+                    'created_at': scanned_at.isoformat()
                 }
-                for scan in scans
+                for product_name, product_score, ingredients_text, scanned_at in rows
             ]
         except Exception as e:
             logger.warning(f"Error getting recent scans for user {user.username}: {e}")
@@ -616,12 +826,14 @@ class PremiumAIService:
         """Get detailed product information for context-aware responses."""
         try:
             # Note: Product model has been removed, so we'll use scan data
-            scan = Scan.objects.filter(id=scan_id).first()
+            scan = Scan.objects.filter(id=scan_id).only(
+                'product_name', 'product_brand', 'product_ingredients_text', 'product_score', 'product_risk_level'
+            ).first()
             if scan and scan.product_name:
                 return {
                     'name': scan.product_name,
                     'brand': scan.product_brand or 'Marque inconnue',
-                    'ingredients': scan.product_ingredients_text.split(', ') if scan.product_ingredients_text else [],
+                    'ingredients': split_ingredients(scan.product_ingredients_text),
                     'safety_score': scan.product_score,
                     'risk_level': scan.product_risk_level
                 }
@@ -637,48 +849,17 @@ class PremiumAIService:
         Check if the question is requesting a routine.
         Amélioré pour distinguer clairement les demandes de routine des questions générales.
         """
-        question_lower = question.lower()
-        
-        # Mots-clés indiquant une demande de routine
-        routine_keywords = [
-            "routine", "routines", "fais-moi", "crée", "génère", "établis",
-            "matin", "soir", "quotidienne", "hebdomadaire", "étapes",
-            "programme", "plan", "ordonnance", "prescription"
-        ]
-        
-        # Phrases typiques de demande de routine
-        routine_phrases = [
-            "fais-moi une routine",
-            "crée une routine",
-            "génère une routine",
-            "établis une routine",
-            "routine du matin",
-            "routine du soir",
-            "routine quotidienne",
-            "routine hebdomadaire",
-            "programme de soins",
-            "plan de soins",
-            "étapes de soins"
-        ]
-        
-        # Vérifier les phrases complètes
-        for phrase in routine_phrases:
-            if phrase in question_lower:
-                return True
-        
-        # Vérifier les mots-clés avec contexte
-        for keyword in routine_keywords:
-            if keyword in question_lower:
-                # Vérifier le contexte pour éviter les faux positifs
-                if any(context in question_lower for context in ["routine", "soins", "matin", "soir", "quotidien"]):
-                    return True
-        
-        return False
+        # Toutes les phrases typiques ("fais-moi une routine", "plan de soins",
+        # ...) contiennent à la fois un mot-clé et un mot de contexte : les deux
+        # expressions précompilées suffisent à couvrir les deux niveaux.
+        return bool(
+            ROUTINE_KEYWORDS_RE.search(question)
+            and ROUTINE_CONTEXT_RE.search(question)
+        )
     
     def _is_ingredient_question(self, question: str) -> bool:
         """Check if the question is about ingredients."""
-        ingredient_keywords = ['ingrédient', 'composant', 'substance', 'formule', 'acide', 'vitamine']
-        return any(keyword in question.lower() for keyword in ingredient_keywords)
+        return INGREDIENT_QUESTION_RE.search(question) is not None
     
     def _generate_routine_response(
         self, 
@@ -714,7 +895,11 @@ class PremiumAIService:
             skin_analysis = context_data.get('skin_analysis', {}) if context_data else {}
             
             # Generate AI response using the AI service
-            ai_response = self._call_ai_service(self._build_routine_prompt(profile, routine_type, budget_filter, context_data))
+            # The prompt only holds formatted profile values, identical profiles share the answer
+            ai_response, is_fallback = self._call_ai_service(
+                self._build_routine_prompt(profile, routine_type, budget_filter, context_data),
+                cache_timeout=AI_PROMPT_CACHE_TIMEOUT
+            )
             
             # Parse the AI response and create structured routine data
             routine_data = self._parse_ai_routine_response(ai_response, routine_type)
@@ -731,7 +916,8 @@ class PremiumAIService:
                 'alternatives': self._generate_budget_alternatives(profile, budget_filter, context_data),
                 'faq': self._generate_routine_faq(routine_type),
                 'skin_analysis': skin_analysis,
-                'budget_applied': budget_filter
+                'budget_applied': budget_filter,
+                'fallback': is_fallback
             }
             
             return response
@@ -745,359 +931,18 @@ class PremiumAIService:
                 'routine': self._create_fallback_routine(routine_type),
                 'alternatives': [],
                 'faq': [],
-                'error': str(e)
-            }
-    
-    def _generate_personalized_routine(
-        self,
-        profile: UserProfile,
-        routine_type: str,
-        budget_filter: Optional[float],
-        skin_analysis: Dict[str, Any],
-        context_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """
-        Generate personalized routine using internal product database.
-        
-        Args:
-            profile: User profile
-            routine_type: Type of routine (morning, evening, etc.)
-            budget_filter: Budget limit
-            skin_analysis: Analyzed skin needs
-            context_data: Complete context data
-            
-        Returns:
-            Dict containing structured routine data
-        """
-        # Get user skin type and preferences
-        skin_type = profile.skin_type
-        if isinstance(skin_type, list):
-            skin_type = skin_type[0] if skin_type else 'normal'
-        elif not skin_type:
-            skin_type = 'normal'
-        
-        # Get recommended ingredients and avoided ingredients
-        recommended_ingredients = skin_analysis.get('recommended_ingredients', [])
-        avoided_ingredients = skin_analysis.get('avoided_ingredients', [])
-        
-        # Filter products based on skin type and budget
-        available_products = self._filter_products_for_user(
-            skin_type, budget_filter, recommended_ingredients, avoided_ingredients
-        )
-        
-        # Generate routine structure based on type
-        if routine_type == 'morning':
-            routine_structure = self._generate_morning_routine(available_products, skin_analysis)
-        elif routine_type == 'evening':
-            routine_structure = self._generate_evening_routine(available_products, skin_analysis)
-        else:
-            routine_structure = self._generate_general_routine(available_products, routine_type, skin_analysis)
-        
-        return {
-            "routine": routine_structure,
-            "explication_globale": self._generate_routine_explanation(profile, routine_type, context_data),
-            "conseils": self._generate_routine_tips(routine_type, skin_analysis),
-            "total_prix": self._calculate_total_price(routine_structure),
-            "score_moyen": self._calculate_average_score(routine_structure)
-        }
-    
-    def _filter_products_for_user(
-        self,
-        skin_type: str,
-        budget_filter: Optional[float],
-        recommended_ingredients: List[str],
-        avoided_ingredients: List[str]
-    ) -> List[Dict[str, Any]]:
-        """
-        Filter products from internal database based on user criteria.
-        
-        Args:
-            skin_type: User's skin type
-            budget_filter: Budget limit
-            recommended_ingredients: Recommended ingredients for skin type
-            avoided_ingredients: Ingredients to avoid
-            
-        Returns:
-            List of filtered products
-        """
-        filtered_products = []
-        
-        for product in self.internal_product_database:
-            # Check skin type compatibility
-            if skin_type not in product.get('skin_types', []) and 'all' not in product.get('skin_types', []):
-                continue
-            
-            # Check budget
-            if budget_filter is not None:
-                product_price = product.get('price', 0)
-                if not isinstance(product_price, (int, float)) or product_price > budget_filter:
-                    continue
-            
-            # Check for avoided ingredients
-            product_ingredients = product.get('ingredients', [])
-            has_avoided_ingredient = any(
-                avoided.lower() in ingredient.lower() 
-                for ingredient in product_ingredients 
-                for avoided in avoided_ingredients
-            )
-            if has_avoided_ingredient:
-                continue
-            
-            # Add product with priority score
-            priority_score = self._calculate_product_priority(product, recommended_ingredients)
-            product_with_priority = product.copy()
-            product_with_priority['priority_score'] = priority_score
-            filtered_products.append(product_with_priority)
-        
-        # Sort by priority score and then by price
-        filtered_products.sort(key=lambda x: (-x['priority_score'], x.get('price', 0) if x.get('price') is not None else 0))
-        
-        return filtered_products
-    
-    def _calculate_product_priority(
-        self, 
-        product: Dict[str, Any], 
-        recommended_ingredients: List[str]
-    ) -> float:
-        """
-        Calculate priority score for a product based on recommended ingredients.
-        
-        Args:
-            product: Product information
-            recommended_ingredients: Recommended ingredients for user's skin type
-            
-        Returns:
-            Priority score (higher is better)
-        """
-        score = 0.0
-        
-        # Base score from product safety score
-        score += product.get('score', 0) * 0.5
-        
-        # Bonus for recommended ingredients
-        product_ingredients = product.get('ingredients', [])
-        for ingredient in product_ingredients:
-            if any(rec.lower() in ingredient.lower() for rec in recommended_ingredients):
-                score += 10
-        
-        # Bonus for high-quality brands
-        brand = product.get('brand', '').lower()
-        premium_brands = ['la roche-posay', 'cerave', 'the ordinary', 'neutrogena']
-        if brand in premium_brands:
-            score += 5
-        
-        return score
-    
-    def _generate_morning_routine(
-        self, 
-        available_products: List[Dict[str, Any]], 
-        skin_analysis: Dict[str, Any]
-    ) -> Dict[str, List[Dict[str, Any]]]:
-        """
-        Generate morning routine structure.
-        
-        Args:
-            available_products: Filtered products for user
-            skin_analysis: Analyzed skin needs
-            
-        Returns:
-            Dict with morning routine structure
-        """
-        morning_products = []
-        
-        # Select products by type in order
-        product_types = ['nettoyant', 'sérum', 'hydratant', 'SPF']
-        
-        for product_type in product_types:
-            type_products = [p for p in available_products if p['type'] == product_type]
-            if type_products:
-                selected_product = type_products[0]  # Take the highest priority
-                morning_products.append({
-                    "type": product_type,
-                    "produit": selected_product['name'],
-                    "marque": selected_product['brand'],
-                    "prix": selected_product['price'],
-                    "score": selected_product['score'],
-                    "explication": self._generate_product_explanation(selected_product, product_type, 'matin')
-                })
-        
-        return {"matin": morning_products, "soir": []}
-    
-    def _generate_evening_routine(
-        self, 
-        available_products: List[Dict[str, Any]], 
-        skin_analysis: Dict[str, Any]
-    ) -> Dict[str, List[Dict[str, Any]]]:
-        """
-        Generate evening routine structure.
-        
-        Args:
-            available_products: Filtered products for user
-            skin_analysis: Analyzed skin needs
-            
-        Returns:
-            Dict with evening routine structure
-        """
-        evening_products = []
-        
-        # Select products by type in order
-        product_types = ['nettoyant', 'actif', 'hydratant']
-        
-        for product_type in product_types:
-            type_products = [p for p in available_products if p['type'] == product_type]
-            if type_products:
-                selected_product = type_products[0]  # Take the highest priority
-                evening_products.append({
-                    "type": product_type,
-                    "produit": selected_product['name'],
-                    "marque": selected_product['brand'],
-                    "prix": selected_product['price'],
-                    "score": selected_product['score'],
-                    "explication": self._generate_product_explanation(selected_product, product_type, 'soir')
-                })
-        
-        return {"matin": [], "soir": evening_products}
-    
-    def _generate_general_routine(
-        self, 
-        available_products: List[Dict[str, Any]], 
-        routine_type: str, 
-        skin_analysis: Dict[str, Any]
-    ) -> Dict[str, List[Dict[str, Any]]]:
-        """
-        Generate general routine structure for other types.
-        
-        Args:
-            available_products: Filtered products for user
-            routine_type: Type of routine
-            skin_analysis: Analyzed skin needs
-            
-        Returns:
-            Dict with routine structure
-        """
-        # For hair and body routines, we'll use a simplified structure
-        selected_products = available_products[:3]  # Take top 3 products
-        
-        products_list = []
-        for product in selected_products:
-            products_list.append({
-                "type": product['type'],
-                "produit": product['name'],
-                "marque": product['brand'],
-                "prix": product['price'],
-                "score": product['score'],
-                "explication": f"Produit adapté pour routine {routine_type}"
-            })
-        
-        return {"matin": products_list, "soir": []}
-    
-    def _generate_product_explanation(
-        self, 
-        product: Dict[str, Any], 
-        product_type: str, 
-        time_of_day: str
-    ) -> str:
-        """
-        Generate explanation for why a product is recommended.
-        
-        Args:
-            product: Product information
-            product_type: Type of product
-            time_of_day: Time of day (matin/soir)
-            
-        Returns:
-            Explanation string
-        """
-        explanations = {
-            'nettoyant': {
-                'matin': 'Nettoyage doux pour éliminer les impuretés de la nuit',
-                'soir': 'Double nettoyage pour éliminer maquillage et impuretés'
-            },
-            'sérum': {
-                'matin': 'Actif ciblé pour traiter les préoccupations spécifiques',
-                'soir': 'Actif réparateur pour la régénération nocturne'
-            },
-            'hydratant': {
-                'matin': 'Hydratation pour préparer la peau à la journée',
-                'soir': 'Hydratation réparatrice pour la nuit'
-            },
-            'SPF': {
-                'matin': 'Protection solaire essentielle pour la journée',
-                'soir': 'Non recommandé le soir'
-            },
-            'actif': {
-                'matin': 'Actif préventif pour la journée',
-                'soir': 'Actif réparateur pour la régénération'
+                'error': str(e),
+                'fallback': True
             }
-        }
-        
-        base_explanation = explanations.get(product_type, {}).get(time_of_day, 'Produit adapté à vos besoins')
-        
-        # Add product-specific information
-        if product.get('description'):
-            base_explanation += f" - {product['description']}"
-        
-        return base_explanation
-    
-    def _calculate_total_price(self, routine_structure: Dict[str, List[Dict[str, Any]]]) -> float:
-        """Calculate total price of routine."""
-        total = 0.0
-        for time_products in routine_structure.values():
-            for product in time_products:
-                price = product.get('prix', 0)
-                if isinstance(price, (int, float)):
-                    total += price
-        return round(total, 2)
-    
-    def _calculate_average_score(self, routine_structure: Dict[str, List[Dict[str, Any]]]) -> float:
-        """Calculate average safety score of routine."""
-        scores = []
-        for time_products in routine_structure.values():
-            for product in time_products:
-                scores.append(product.get('score', 0))
-        
-        if scores:
-            return round(sum(scores) / len(scores), 1)
-        return 0.0
-    
-    def _generate_routine_tips(self, routine_type: str, skin_analysis: Dict[str, Any]) -> List[str]:
-        """Generate tips for the routine."""
-        tips = []
-        
-        if routine_type == 'morning':
-            tips.extend([
-                "Appliquez les produits du plus léger au plus épais",
-                "Attendez 2-3 minutes entre chaque étape",
-                "Protégez toujours votre peau du soleil",
-                "Adaptez les produits selon votre type de peau"
-            ])
-        elif routine_type == 'evening':
-            tips.extend([
-                "Double nettoyage obligatoire pour éliminer toutes les impuretés",
-                "Le soir est idéal pour les actifs forts comme le rétinol",
-                "Utilisez une crème plus riche pour la nuit",
-                "Évitez les actifs photosensibilisants le matin"
-            ])
-        
-        # Add skin-specific tips
-        if skin_analysis.get('routine_focus'):
-            tips.append(f"Focus: {skin_analysis['routine_focus']}")
-        
-        return tips
     
     def _extract_routine_type(self, question: str) -> str:
         """Extract routine type from user question."""
-        question_lower = question.lower()
-        if 'matin' in question_lower:
-            return 'morning'
-        elif 'soir' in question_lower:
-            return 'evening'
-        elif 'cheveux' in question_lower:
-            return 'hair'
-        elif 'corps' in question_lower:
-            return 'body'
-        else:
-            return 'morning'  # Default
+        # One scan collects every keyword, the first one in priority order wins
+        found = {keyword.lower() for keyword in ROUTINE_TYPE_RE.findall(question)}
+        for keyword, routine_type in ROUTINE_TYPES_BY_KEYWORD:
+            if keyword in found:
+                return routine_type
+        return 'morning'  # Default
     
     def _build_routine_prompt(
         self, 
@@ -1120,117 +965,25 @@ class PremiumAIService:
         """
         budget_text = f"Budget maximum: {budget_filter}€" if budget_filter else "Budget flexible"
         
-        # Handle skin_type - convert list to string if necessary
-        skin_type = profile.skin_type
-        if isinstance(skin_type, list):
-            skin_type = ", ".join(skin_type) if skin_type else "Non spécifié"
-        elif not skin_type:
-            skin_type = "Non spécifié"
-        
-        # Handle skin_concerns - convert list to string if necessary
-        skin_concerns = profile.skin_concerns
-        if isinstance(skin_concerns, list):
-            skin_concerns = ", ".join(skin_concerns) if skin_concerns else "Aucune"
-        elif not skin_concerns:
-            skin_concerns = "Aucune"
-        
-        # Handle pathologies - convert list to string if necessary
-        pathologies = profile.pathologies
-        if isinstance(pathologies, list):
-            pathologies = ", ".join(pathologies) if pathologies else "Aucune"
-        elif not pathologies:
-            pathologies = "Aucune"
-        
         # Build context information
         context_info = ""
         if context_data:
-            if context_data.get('allergies'):
-                allergies_text = ", ".join([a['ingredient'] for a in context_data['allergies']])
+            if context_data.get('allergy_names'):
+                allergies_text = ", ".join(context_data['allergy_names'])
                 context_info += f"\nAllergies: {allergies_text}"
             
             if context_data.get('scan_history'):
                 context_info += f"\nHistorique scans: {len(context_data['scan_history'])} produits récents"
         
-        prompt = f"""
-        Créez une routine de soins {routine_type} personnalisée en français avec les spécifications suivantes:
-        
-        Profil utilisateur:
-        - Type de peau: {skin_type}
-        - Préoccupations: {skin_concerns}
-        - Âge: {profile.age_range or 'Non spécifié'}
-        - Budget: {budget_text}
-        - Pathologies: {pathologies}{context_info}
-        
-        Format de réponse JSON requis:
-        {{
-            "routine": {{
-                "matin": [
-                    {{
-                        "type": "nettoyant",
-                        "produit": "Nom du produit",
-                        "marque": "Marque",
-                        "prix": 15.99,
-                        "score": 85,
-                        "explication": "Pourquoi ce produit est recommandé"
-                    }}
-                ],
-                "soir": [
-                    {{
-                        "type": "démaquillant",
-                        "produit": "Nom du produit",
-                        "marque": "Marque",
-                        "prix": 12.99,
-                        "score": 88,
-                        "explication": "Pourquoi ce produit est recommandé"
-                    }}
-                ]
-            }},
-            "explication_globale": "Explication des besoins de la peau",
-            "conseils": ["Conseil 1", "Conseil 2"]
-        }}
-        
-        Assurez-vous que tous les produits sont adaptés au type de peau et au budget.
-        Incluez des explications sur les besoins spécifiques de la peau.
-        """
-        
-        return prompt
-    
-    def _parse_routine_response(self, ai_response: str, routine_type: str) -> Dict[str, Any]:
-        """
-        Parse AI response and extract structured routine data.
-        
-        Args:
-            ai_response: Raw response from the AI service
-            routine_type: Type of routine being generated
-            
-        Returns:
-            Dict containing structured routine data
-        """
-        try:
-            # Try to extract JSON from response
-            if '{' in ai_response and '}' in ai_response:
-                start = ai_response.find('{')
-                end = ai_response.rfind('}') + 1
-                json_str = ai_response[start:end]
-                parsed_response = json.loads(json_str)
-                
-                # Validate the structure
-                if 'routine' in parsed_response:
-                    return parsed_response
-                else:
-                    logger.warning("AI response missing 'routine' key, using fallback")
-                    return self._create_fallback_routine(routine_type)
-            else:
-                # If no JSON found, create a fallback routine
-                logger.info("No JSON found in AI response, using fallback")
-                return self._create_fallback_routine(routine_type)
-                
-        except json.JSONDecodeError as e:
-            logger.warning(f"Failed to parse AI response as JSON: {e}, using fallback")
-            return self._create_fallback_routine(routine_type)
-        except Exception as e:
-            logger.error(f"Unexpected error parsing AI response: {e}, using fallback")
-            return self._create_fallback_routine(routine_type)
+        return _routine_prompt(
+            routine_type,
+            _profile_text(profile.skin_type, "Non spécifié"),
+            _profile_text(profile.skin_concerns, "Aucune"),
+            profile.age_range or 'Non spécifié',
+            budget_text,
+            _profile_text(profile.pathologies, "Aucune"),
+            context_info
+        )
     
     def _create_fallback_routine(self, routine_type: str) -> Dict[str, Any]:
         """
@@ -1368,6 +1121,19 @@ class PremiumAIService:
         if budget_filter is None:
             return routine_data
         
+        # The prompt already asks for products within budget, usually nothing is dropped
+        routine = routine_data['routine']
+        if (
+            routine.keys() == {'matin', 'soir'}
+            and isinstance(routine['matin'], list)
+            and isinstance(routine['soir'], list)
+            and all(
+                isinstance(product.get('prix', 0), (int, float)) and product.get('prix', 0) <= budget_filter
+                for product in chain(routine['matin'], routine['soir'])
+            )
+        ):
+            return routine_data
+        
         filtered_routine = {'matin': [], 'soir': []}
         
         for time_of_day in ['matin', 'soir']:
@@ -1381,49 +1147,6 @@ class PremiumAIService:
         routine_data['routine'] = filtered_routine
         return routine_data
     
-    def _generate_routine_explanation(self, profile: UserProfile, routine_type: str, context_data: Dict[str, Any] = None) -> str:
-        """
-        Generate explanation of skin needs based on profile.
-        
-        Args:
-            profile: User profile containing skin information
-            routine_type: Type of routine being generated
-            context_data: Additional context data
-            
-        Returns:
-            str: Personalized explanation for the routine
-        """
-        # Handle skin_type - convert list to string if necessary
-        skin_type = profile.skin_type
-        if isinstance(skin_type, list):
-            skin_type = ", ".join(skin_type) if skin_type else "votre type de peau"
-        elif not skin_type:
-            skin_type = "votre type de peau"
-        
-        # Handle skin_concerns - convert list to string if necessary
-        concerns = profile.skin_concerns
-        if isinstance(concerns, list):
-            concerns = ", ".join(concerns) if concerns else "la santé générale de votre peau"
-        elif not concerns:
-            concerns = "la santé générale de votre peau"
-        
-        # Add context-specific information
-        context_info = ""
-        if context_data and context_data.get('dermatological_knowledge'):
-            knowledge = context_data['dermatological_knowledge']
-            if isinstance(skin_type, str) and skin_type in knowledge.get('skin_types', {}):
-                skin_info = knowledge['skin_types'][skin_type]
-                context_info = f" Votre peau {skin_type} a besoin de: {', '.join(skin_info.get('needs', []))}."
-        
-        explanations = {
-            'morning': f"Votre peau {skin_type} nécessite une routine matinale qui protège et prépare votre peau pour la journée. Nous nous concentrons sur {concerns}.{context_info}",
-            'evening': f"Le soir, votre peau {skin_type} a besoin de récupération et de réparation. Cette routine cible {concerns} pour optimiser la régénération nocturne.{context_info}",
-            'hair': "Vos cheveux méritent autant d'attention que votre peau. Cette routine capillaire est adaptée à vos besoins spécifiques.",
-            'body': "Votre corps a des besoins différents de votre visage. Cette routine corporelle cible vos zones de préoccupation."
-        }
-        
-        return explanations.get(routine_type, "Routine personnalisée adaptée à vos besoins.")
-    
     def _generate_budget_alternatives(self, profile: UserProfile, budget_filter: Optional[float], context_data: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Generate budget-friendly alternatives for recommended products."""
         if budget_filter is None or budget_filter > 50:
@@ -1504,8 +1227,9 @@ class PremiumAIService:
             # Build prompt for ingredient analysis
             prompt = self._build_ingredient_prompt(ingredient_name, context_data)
             
-            # Get AI response using real AI service
-            analysis = self._call_ai_service(prompt)
+            # Get AI response using real AI service; the prompt only depends on the
+            # ingredient, skin type and allergies, so answers are shared across users
+            analysis, is_fallback = self._call_ai_service(prompt, cache_timeout=AI_PROMPT_CACHE_TIMEOUT)
             
             # Generate personalized explanation
             explanation = self._generate_ingredient_explanation(ingredient_name, analysis, context_data)
@@ -1515,7 +1239,8 @@ class PremiumAIService:
                 'explanation': explanation,
                 'ingredients_analyzed': [ingredient_name],
                 'analysis_details': analysis,
-                'alerts': self._generate_ingredient_alerts(ingredient_name, analysis, context_data)
+                'alerts': self._generate_ingredient_alerts(ingredient_name, analysis, context_data),
+                'fallback': is_fallback
             }
             
         except Exception as e:
@@ -1524,22 +1249,18 @@ class PremiumAIService:
                 'type': 'ingredient_analysis',
                 'explanation': 'Je ne peux pas analyser cet ingrédient pour le moment. Veuillez réessayer plus tard.',
                 'ingredients_analyzed': [],
-                'alerts': ['Erreur lors de l\'analyse de l\'ingrédient']
+                'alerts': ['Erreur lors de l\'analyse de l\'ingrédient'],
+                'fallback': True
             }
     
     def _extract_ingredient_from_question(self, question: str) -> Optional[str]:
         """Extract ingredient name from user question."""
         question_lower = question.lower()
+        question_folded = fold_accents(question_lower)
         
-        # Common ingredient keywords
-        ingredient_keywords = [
-            'acide hyaluronique', 'rétinol', 'vitamine c', 'niacinamide', 'peptides',
-            'acide salicylique', 'acide glycolique', 'acide lactique', 'collagène',
-            'élastine', 'céramides', 'acides gras', 'antioxydants', 'spf'
-        ]
-        
-        for keyword in ingredient_keywords:
-            if keyword in question_lower:
+        # Common ingredient keywords, matched with or without accents
+        for folded_keyword, keyword in INGREDIENT_KEYWORDS:
+            if folded_keyword in question_folded:
                 return keyword
         
         # Try to extract from question structure
@@ -1606,10 +1327,10 @@ class PremiumAIService:
         
         try:
             # Check for allergies
-            user_allergies = context_data.get('allergies', [])
-            for allergy in user_allergies:
-                if allergy['ingredient'].lower() in ingredient_name.lower():
-                    alerts.append(f"⚠️ Attention : Vous êtes allergique à {allergy['ingredient']}")
+            ingredient_lower = ingredient_name.lower()
+            for allergy_name in context_data.get('allergy_names', ()):
+                if allergy_name.lower() in ingredient_lower:
+                    alerts.append(f"⚠️ Attention : Vous êtes allergique à {allergy_name}")
             
             # Check for sensitive skin
             skin_type = context_data.get('user_profile', {}).get('skin_type', '')
@@ -1637,13 +1358,7 @@ class PremiumAIService:
             List of alternative ingredient suggestions
         """
         alternatives = []
-        skin_type = context_data['user_profile']['skin_type']
-        
-        # Handle skin_type - convert list to string if necessary
-        if isinstance(skin_type, list):
-            skin_type = skin_type[0] if skin_type else None
-        elif not skin_type:
-            skin_type = None
+        skin_type = _primary_skin_type(context_data['user_profile']['skin_type'], None)
         
         # Suggest alternatives based on skin type
         if skin_type == 'sensitive':
@@ -1671,7 +1386,7 @@ class PremiumAIService:
             prompt = self._build_natural_general_prompt(question, context_data)
             
             # Get AI response using real AI service
-            ai_response = self._call_ai_service(prompt)
+            ai_response, is_fallback = self._call_ai_service(prompt, cache_timeout=AI_PROMPT_CACHE_TIMEOUT)
             
             # Log the response for debugging
             logger.info(f"AI Response for general question: {ai_response[:200]}...")
@@ -1685,7 +1400,8 @@ class PremiumAIService:
                     'allergies': context_data.get('user_profile', {}).get('allergies', []),
                     'conditions': context_data.get('user_profile', {}).get('dermatological_conditions', [])
                 },
-                'timestamp': self._get_current_timestamp()
+                'timestamp': self._get_current_timestamp(),
+                'fallback': is_fallback
             }
             
         except Exception as e:
@@ -1694,7 +1410,8 @@ class PremiumAIService:
                 'type': 'natural_response',
                 'answer': 'Je suis désolé, je ne peux pas répondre à votre question pour le moment. Veuillez réessayer plus tard.',
                 'user_profile_used': {},
-                'timestamp': self._get_current_timestamp()
+                'timestamp': self._get_current_timestamp(),
+                'fallback': True
             }
     
     def _build_natural_general_prompt(self, question: str, context_data: Dict[str, Any]) -> str:
@@ -1756,16 +1473,13 @@ Réponds comme si tu répondais à une question ponctuelle, de façon naturelle
             str: Personalized prompt for AI
         """
         # Get user skin type for personalization
-        skin_type = context_data.get('user_profile', {}).get('skin_type', 'Non spécifié')
-        if isinstance(skin_type, list):
-            skin_type = ", ".join(skin_type) if skin_type else "Non spécifié"
+        skin_type = _profile_text(context_data.get('user_profile', {}).get('skin_type'), "Non spécifié")
         
         # Get user allergies
-        allergies = context_data.get('allergies', [])
+        allergy_names = context_data.get('allergy_names', ())
         allergy_text = ""
-        if allergies:
-            allergy_list = [a['ingredient'] for a in allergies]
-            allergy_text = f"\nAllergies de l'utilisateur: {', '.join(allergy_list)}"
+        if allergy_names:
+            allergy_text = f"\nAllergies de l'utilisateur: {', '.join(allergy_names)}"
         
         prompt = f"""
         Analysez l'ingrédient cosmétique "{ingredient_name}" en français.
@@ -1799,15 +1513,9 @@ Réponds comme si tu répondais à une question ponctuelle, de façon naturelle
         """
         # Get user profile information
         user_profile = context_data.get('user_profile', {})
-        skin_type = user_profile.get('skin_type', 'Non spécifié')
+        skin_type = _profile_text(user_profile.get('skin_type'), "Non spécifié")
         age_range = user_profile.get('age_range', 'Non spécifié')
-        concerns = user_profile.get('skin_concerns', 'Aucune')
-        
-        # Handle list types
-        if isinstance(skin_type, list):
-            skin_type = ", ".join(skin_type) if skin_type else "Non spécifié"
-        if isinstance(concerns, list):
-            concerns = ", ".join(concerns) if concerns else "Aucune"
+        concerns = _profile_text(user_profile.get('skin_concerns'), "Aucune")
         
         prompt = f"""
         Répondez à cette question sur les soins de la peau en français :
@@ -1918,19 +1626,8 @@ Réponds comme si tu répondais à une question ponctuelle, de façon naturelle
         Returns:
             Dict containing user context summary for display
         """
-        # Handle skin_type - convert list to string if necessary
-        skin_type = profile.skin_type
-        if isinstance(skin_type, list):
-            skin_type = ", ".join(skin_type) if skin_type else "Non spécifié"
-        elif not skin_type:
-            skin_type = "Non spécifié"
-        
-        # Handle skin_concerns - convert list to string if necessary
-        concerns = profile.skin_concerns
-        if isinstance(concerns, list):
-            concerns = ", ".join(concerns) if concerns else "Aucune préoccupation spécifique"
-        elif not concerns:
-            concerns = "Aucune préoccupation spécifique"
+        skin_type = _profile_text(profile.skin_type, "Non spécifié")
+        concerns = _profile_text(profile.skin_concerns, "Aucune préoccupation spécifique")
         
         return {
             'skin_type': skin_type,
@@ -1959,38 +1656,54 @@ Réponds comme si tu répondais à une question ponctuelle, de façon naturelle
         
         return alerts
     
-    def _call_ai_service(self, prompt: str) -> str:
+    def _call_ai_service(self, prompt: str, cache_timeout: Optional[int] = None) -> Tuple[str, bool]:
         """
         Call AI service (Ollama or external API) to get response.
         
         Args:
             prompt: The prompt to send to the AI service
+            cache_timeout: If set, share successful AI responses to this exact
+                prompt through the cache for this many seconds
             
         Returns:
-            str: AI response
+            Tuple[str, bool]: AI response, and whether it is a canned fallback
+            answer rather than one from the AI backend
         """
         try:
             # Check if fallback mode is enabled for development
             if getattr(settings, 'ENABLE_AI_FALLBACK_MODE', False):
                 logger.info("Using development fallback mode for AI responses")
-                return self._generate_fallback_response(prompt)
+                return self._generate_fallback_response(prompt), True
             
-            # Try Ollama first (local AI)
-            if hasattr(settings, 'OLLAMA_URL') and settings.OLLAMA_URL:
-                return self._call_ollama(prompt)
+            if cache_timeout is not None:
+                # Whitespace differences (prompt template indentation) do not change the answer
+                canonical_prompt = ' '.join(prompt.split())
+                cache_key = f'premium_ai_prompt_{hashlib.blake2b(canonical_prompt.encode(), digest_size=16).hexdigest()}'
+                cached_response = cache.get(cache_key)
+                if cached_response is not None:
+                    return cached_response, False
             
-            # Fallback to external API if configured
+            # Try Ollama first (local AI), then the external API if configured
+            if hasattr(settings, 'OLLAMA_URL') and settings.OLLAMA_URL:
+                response = self._call_ollama(prompt)
             elif hasattr(settings, 'OPENAI_API_KEY') and settings.OPENAI_API_KEY:
-                return self._call_openai(prompt)
+                response = self._call_openai(prompt)
+            else:
+                response = None
+            
+            if response is not None:
+                # Fallback responses below are never cached, nor are empty answers
+                if cache_timeout is not None and response:
+                    cache.set(cache_key, response, cache_timeout)
+                return response, False
             
             # If no AI service configured, return fallback response
-            else:
-                logger.warning("No AI service configured, using fallback response")
-                return self._generate_fallback_response(prompt)
+            logger.warning("No AI service configured, using fallback response")
+            return self._generate_fallback_response(prompt), True
                 
         except Exception as e:
             logger.error(f"Error calling AI service: {str(e)}")
-            return self._generate_fallback_response(prompt)
+            return self._generate_fallback_response(prompt), True
     
     def _call_ollama(self, prompt: str) -> str:
         """Call Ollama local AI service."""
@@ -2246,6 +1959,16 @@ Réponds comme si tu répondais à une question ponctuelle, de façon naturelle
             Dict containing structured routine data
         """
         try:
+            # The prompt asks for a JSON object; decode it in place, ignoring surrounding text
+            start = ai_response.find('{')
+            if start >= 0:
+                try:
+                    parsed_response, _ = JSON_DECODER.raw_decode(ai_response, start)
+                except json.JSONDecodeError:
+                    parsed_response = None
+                if isinstance(parsed_response, dict) and isinstance(parsed_response.get('routine'), dict):
+                    return parsed_response
+            
             # For fallback responses, create structured data from text
             routine_data = {
                 'routine': {
@@ -2405,6 +2128,10 @@ Réponds comme si tu répondais à une question ponctuelle, de façon naturelle
         }
 
 
+# Create global service instance (stateless, all per-request data is passed around)
+premium_ai_service = PremiumAIService()
+
+
 class PremiumRoutineManager:
     """
     Manager for Premium routine operations including saving, updating, and tracking.
@@ -2412,7 +2139,7 @@ class PremiumRoutineManager:
     
     def __init__(self, user: User):
         self.user = user
-        self.ai_service = PremiumAIService()
+        self.ai_service = premium_ai_service
     
     def create_personalized_routine(
         self, 
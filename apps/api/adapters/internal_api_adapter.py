@@ -5,9 +5,14 @@ This adapter transforms the internal API endpoints to use Clean Architecture
 use cases while maintaining the same interface and behavior.
 """
 
+import hmac
+import json
 import logging
 from typing import Dict, Any, Optional
-from django.http import HttpRequest, JsonResponse
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.cache import never_cache
 from django.views.decorators.csrf import csrf_exempt
@@ -17,9 +22,25 @@ from usecases.user.update_user_profile import UpdateUserProfileUseCase
 from infrastructure.repositories.django_user_repository import DjangoUserRepository
 from infrastructure.repositories.django_profile_repository import DjangoProfileRepository
 from core.exceptions import UserNotFoundError, ProfileNotFoundError
+from apps.accounts.models import PROFILE_CACHE_TIMEOUT, profile_cache_key
 
 logger = logging.getLogger(__name__)
 
+# Fixed error bodies are serialized once; a fresh response is still built per request
+FORBIDDEN_BODY = json.dumps({
+    'status': 'error',
+    'message': 'Accès non autorisé - API interne uniquement'
+}).encode()
+INTERNAL_ERROR_BODY = json.dumps({
+    'status': 'error',
+    'message': 'Erreur interne du serveur'
+}).encode()
+
+
+def _json_bytes_response(body: bytes, status: int) -> HttpResponse:
+    """Build a JSON response from pre-serialized bytes."""
+    return HttpResponse(body, content_type='application/json', status=status)
+
 
 class InternalAPIAdapter:
     """
@@ -31,6 +52,11 @@ class InternalAPIAdapter:
     
     def __init__(self):
         """Initialize adapter with repositories and use cases."""
+        # Encoded once; compared in constant time on every request
+        self._expected_token = getattr(
+            settings, 'INTERNAL_API_TOKEN', 'internal_beautyscan_2024'
+        ).encode()
+        
         # Create repositories
         self._user_repository = DjangoUserRepository()
         self._profile_repository = DjangoProfileRepository()
@@ -60,13 +86,14 @@ class InternalAPIAdapter:
             # Validate internal request
             if not self._validate_internal_request(request):
                 logger.warning(f"Unauthorized access attempt to internal API from {request.META.get('REMOTE_ADDR')}")
-                return JsonResponse({
-                    'status': 'error',
-                    'message': 'Accès non autorisé - API interne uniquement'
-                }, status=403)
+                return _json_bytes_response(FORBIDDEN_BODY, 403)
             
-            # Get user profile using use case
-            profile_data = self._get_user_profile_use_case.execute(user_id)
+            # Get user profile using use case (cached, shared with the profile page)
+            profile_data = cache.get_or_set(
+                profile_cache_key(user_id),
+                lambda: self._get_user_profile_use_case.execute(user_id),
+                PROFILE_CACHE_TIMEOUT
+            )
             
             if not profile_data:
                 logger.warning(f"User profile {user_id} not found")
@@ -95,10 +122,7 @@ class InternalAPIAdapter:
             }, status=404)
         except Exception as e:
             logger.error(f"Unexpected error in internal API: {str(e)}")
-            return JsonResponse({
-                'status': 'error',
-                'message': 'Erreur interne du serveur'
-            }, status=500)
+            return _json_bytes_response(INTERNAL_ERROR_BODY, 500)
     
     def handle_update_user_profile(self, request: HttpRequest) -> JsonResponse:
         """
@@ -114,13 +138,9 @@ class InternalAPIAdapter:
             # Validate internal request
             if not self._validate_internal_request(request):
                 logger.warning(f"Unauthorized access attempt to internal API from {request.META.get('REMOTE_ADDR')}")
-                return JsonResponse({
-                    'status': 'error',
-                    'message': 'Accès non autorisé - API interne uniquement'
-                }, status=403)
+                return _json_bytes_response(FORBIDDEN_BODY, 403)
             
             # Parse JSON data
-            import json
             data = json.loads(request.body)
             user_id = data.get('user_id')
             profile_updates = data.get('profile_updates', {})
@@ -131,8 +151,9 @@ class InternalAPIAdapter:
                     'message': 'user_id est requis'
                 }, status=400)
             
-            # Update user profile using use case
-            updated_profile = self._update_user_profile_use_case.execute(user_id, profile_updates)
+            # Update user profile using use case (one transaction, profile row locked)
+            with transaction.atomic():
+                updated_profile = self._update_user_profile_use_case.execute(user_id, profile_updates)
             
             if updated_profile:
                 logger.info(f"User profile {user_id} updated successfully")
@@ -192,12 +213,8 @@ class InternalAPIAdapter:
         if not internal_token:
             return False
         
-        # Validate token
-        expected_token = 'internal_beautyscan_2024'
-        if internal_token != expected_token:
-            return False
-        
-        return True
+        # Validate token without leaking its prefix through timing
+        return hmac.compare_digest(internal_token.encode(), self._expected_token)
 
 
 # Create global adapter instance
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-10-18 05:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scans', '0008_auto_20250914_2358'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scan',
+            index=models.Index(fields=['user', '-scanned_at'], name='scan_user_scanned_idx'),
+        ),
+    ]
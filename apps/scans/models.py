@@ -2,11 +2,16 @@
 Models for product scanning functionality.
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.utils import timezone
 from datetime import timedelta
 
+from apps.accounts.models import premium_context_version_key
+
 
 class Scan(models.Model):
     """Product scan record with embedded product information."""
@@ -35,6 +40,10 @@ class Scan(models.Model):
     
     class Meta:
         ordering = ['-scanned_at']
+        indexes = [
+            # Recent scans of a user (history pages, Premium AI context)
+            models.Index(fields=['user', '-scanned_at'], name='scan_user_scanned_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.product_name or 'Unknown Product'} - {self.scanned_at.date()}"
@@ -207,3 +216,8 @@ class ProductCache(models.Model):
         }
 
 
+@receiver([post_save, post_delete], sender=Scan)
+def invalidate_premium_context(sender, instance, **kwargs):
+    """Drop cached Premium AI responses built from the user's scan history."""
+    key = premium_context_version_key(instance.user_id)
+    transaction.on_commit(lambda: cache.delete(key))
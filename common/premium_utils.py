@@ -90,7 +90,6 @@ def is_authorized_developer(user) -> bool:
     Returns:
         bool: True if user is authorized developer, False otherwise
     """
-    from django.contrib.auth.models import User
     if not user or not user.is_authenticated:
         return False
     
@@ -120,7 +119,6 @@ def is_premium_user(user) -> bool:
     Returns:
         bool: True if user has Premium access, False otherwise
     """
-    from django.contrib.auth.models import User
     if not user or not user.is_authenticated:
         return False
     
@@ -186,25 +184,29 @@ def is_premium_user(user) -> bool:
         return False
 
 
-def force_premium_for_development(user) -> None:
+def force_premium_for_development(users) -> int:
     """
-    Force Premium status for a user in development mode.
+    Force Premium status for one or more users in development mode.
     
     This function is for developer testing only and should never be used in production.
-    It directly updates the user's subscription type without payment verification,
-    allowing developers to test Premium features easily.
+    It directly updates the users' subscription type without payment verification,
+    allowing developers to test Premium features easily. All profiles are
+    upgraded with a single UPDATE query.
     
     The function includes multiple security checks to prevent misuse:
     - Requires DEBUG mode to be enabled
     - Requires IS_PREMIUM_DEV_MODE to be enabled
-    - Requires user to be in authorized developers list
+    - Requires every user to be in authorized developers list
     - Requires development environment
     
     Args:
-        user: Django User object to upgrade to Premium
+        users: Django User object, or iterable of User objects, to upgrade to Premium
+        
+    Returns:
+        int: Number of profiles upgraded
         
     Raises:
-        RuntimeError: If called in production environment or user not authorized
+        RuntimeError: If called in production environment or a user is not authorized
     """
     from django.contrib.auth.models import User
     if not getattr(settings, 'DEBUG', False):
@@ -225,16 +227,32 @@ def force_premium_for_development(user) -> None:
     #         "force_premium_for_development() can only be used in a development environment"
     #     )
     
-    if not is_authorized_developer(user):
-        raise RuntimeError(
-            f"User '{user.username}' is not authorized for Premium dev mode. "
-            f"Add to AUTHORIZED_DEV_USERS in settings."
-        )
+    users = [users] if isinstance(users, User) else list(users)
+    for user in users:
+        if not is_authorized_developer(user):
+            raise RuntimeError(
+                f"User '{user.username}' is not authorized for Premium dev mode. "
+                f"Add to AUTHORIZED_DEV_USERS in settings."
+            )
     
     try:
-        user.profile.subscription_type = 'premium'
-        user.profile.save()
-        clear_premium_cache(user)
+        from django.core.cache import cache
+        from django.db import transaction
+        from django.utils import timezone
+        from apps.accounts.models import UserProfile, profile_cache_key, premium_context_version_key
+        
+        # QuerySet.update() skips auto_now and post_save: bump updated_at so the
+        # profile ETag changes, and drop cached profile data once committed
+        now = timezone.now()
+        updated = UserProfile.objects.filter(user__in=users).update(subscription_type='premium', updated_at=now)
+        keys = [key for user in users for key in (profile_cache_key(user.pk), premium_context_version_key(user.pk))]
+        transaction.on_commit(lambda: cache.delete_many(keys))
+        for user in users:
+            if User.profile.is_cached(user):
+                user.profile.subscription_type = 'premium'
+                user.profile.updated_at = now
+            clear_premium_cache(user)
+        return updated
     except Exception as e:
         raise RuntimeError(f"Failed to upgrade user to Premium: {e}")
 
@@ -582,7 +600,8 @@ class UserPreferencesManager:
         for form_field, profile_field in field_mapping.items():
             if form_field in preferences:
                 value = preferences[form_field]
-                if isinstance(value, list):
+                # JSON list fields keep lists, text fields store them comma-separated
+                if isinstance(value, list) and profile_field not in self.profile.CHOICE_LIST_FIELDS:
                     value = ', '.join(value)
                 setattr(self.profile, profile_field, value)
         
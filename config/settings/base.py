@@ -174,6 +174,13 @@ USE_I18N = True
 
 USE_TZ = True
 
+# Resolve request.user together with its profile in a single query.
+# ModelBackend stays listed so sessions recorded under it remain valid.
+AUTHENTICATION_BACKENDS = [
+    'apps.accounts.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 # Authentication URLs for login/logout flow
 # These URLs are used by Django's authentication system
 LOGIN_URL = '/login/'
@@ -7,7 +7,10 @@ This repository implements the ProfileRepository interface using Django ORM.
 import logging
 from typing import Optional, List
 from django.contrib.auth.models import User as DjangoUser
-from apps.accounts.models import UserProfile as DjangoUserProfile
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from apps.accounts.models import UserProfile as DjangoUserProfile, profile_cache_key, premium_context_version_key
 
 from core.entities.user import User
 from core.entities.profile import UserProfile
@@ -18,7 +21,6 @@ from interfaces.repositories.profile_repository import ProfileRepository
 
 logger = logging.getLogger(__name__)
 
-
 class DjangoProfileRepository(ProfileRepository):
     """
     Django ORM implementation of ProfileRepository.
@@ -63,6 +65,34 @@ class DjangoProfileRepository(ProfileRepository):
         """
         return self.get_by_user_id(user.id)
     
+    def get_user_with_profile(self, user_id: int, for_update: bool = False) -> Optional[UserProfile]:
+        """
+        Get user and profile in a single query using Django ORM.
+        
+        The user row is joined with select_related so that building the
+        domain entity does not trigger a second query.
+        
+        Args:
+            user_id: User identifier
+            for_update: Lock the profile and user rows (SELECT ... FOR UPDATE);
+                must be called inside a transaction
+            
+        Returns:
+            UserProfile entity or None if user or profile not found
+        """
+        try:
+            queryset = DjangoUserProfile.objects.select_related('user')
+            if for_update:
+                queryset = queryset.select_for_update()
+            django_profile = queryset.get(user_id=user_id)
+            return self._to_domain_entity(django_profile)
+        except DjangoUserProfile.DoesNotExist:
+            logger.warning(f"Profile for user {user_id} not found")
+            return None
+        except Exception as e:
+            logger.error(f"Error retrieving profile for user {user_id}: {str(e)}")
+            raise ProfileNotFoundError(f"Error retrieving profile for user {user_id}: {str(e)}")
+    
     def save(self, profile: UserProfile) -> UserProfile:
         """
         Save user profile entity using Django ORM.
@@ -74,32 +104,28 @@ class DjangoProfileRepository(ProfileRepository):
             Saved UserProfile entity
         """
         try:
-            django_user = DjangoUser.objects.get(id=profile.user.id)
-            
             if profile.id and profile.id > 0:
-                # Update existing profile
-                django_profile = DjangoUserProfile.objects.get(id=profile.id)
-                self._update_django_profile(django_profile, profile)
-                django_profile.save()
-                logger.info(f"Updated profile {profile.id}")
-            else:
-                # Create new profile
-                django_profile = DjangoUserProfile.objects.create(
-                    user=django_user,
-                    subscription_type=profile.subscription_type,
-                    skin_type=profile.skin_type,
-                    age_range=profile.age_range,
-                    skin_concerns=profile.skin_concerns,
-                    dermatological_conditions=profile.dermatological_conditions,
-                    dermatological_other=profile.dermatological_other,
-                    allergies=profile.allergies,
-                    allergies_other=profile.allergies_other,
-                    product_style=profile.product_style,
-                    routine_frequency=profile.routine_frequency,
-                    objectives=profile.objectives,
-                    budget=profile.budget
+                # Update existing profile in a single UPDATE (no SELECT, no full-row save)
+                updated = DjangoUserProfile.objects.filter(id=profile.id).update(
+                    updated_at=timezone.now(),
+                    **self._profile_field_values(profile)
                 )
-                logger.info(f"Created new profile {django_profile.id}")
+                if not updated:
+                    raise ProfileNotFoundError(f"Profile {profile.id} not found")
+                # update() skips post_save, so drop the cached profile data here,
+                # after commit so a concurrent read cannot cache the old row again
+                keys = [profile_cache_key(profile.user.id), premium_context_version_key(profile.user.id)]
+                transaction.on_commit(lambda: cache.delete_many(keys))
+                logger.info(f"Updated profile {profile.id}")
+                return profile
+            
+            # Create new profile
+            django_user = DjangoUser.objects.get(id=profile.user.id)
+            django_profile = DjangoUserProfile.objects.create(
+                user=django_user,
+                **self._profile_field_values(profile)
+            )
+            logger.info(f"Created new profile {django_profile.id}")
             
             return self._to_domain_entity(django_profile)
             
@@ -224,41 +250,47 @@ class DjangoProfileRepository(ProfileRepository):
             is_superuser=django_profile.user.is_superuser
         )
         
+        choice_lists = django_profile.get_all_choice_lists()
+        
         # Create UserProfile domain entity
         return UserProfile(
             user=user,
             subscription_type=django_profile.subscription_type,
             skin_type=django_profile.skin_type,
             age_range=django_profile.age_range,
-            skin_concerns=django_profile.get_skin_concerns_list(),
-            dermatological_conditions=django_profile.get_dermatological_conditions_list(),
+            skin_concerns=choice_lists['skin_concerns'],
+            dermatological_conditions=choice_lists['dermatological_conditions'],
             dermatological_other=django_profile.dermatological_other,
-            allergies=django_profile.get_allergies_list(),
+            allergies=choice_lists['allergies'],
             allergies_other=django_profile.allergies_other,
             product_style=django_profile.product_style,
             routine_frequency=django_profile.routine_frequency,
-            objectives=django_profile.get_objectives_list(),
+            objectives=choice_lists['objectives'],
             budget=django_profile.budget,
             profile_id=django_profile.id
         )
     
-    def _update_django_profile(self, django_profile: DjangoUserProfile, profile: UserProfile) -> None:
+    def _profile_field_values(self, profile: UserProfile) -> dict:
         """
-        Update Django profile model with domain entity data.
+        Map domain entity data to Django profile model fields.
         
         Args:
-            django_profile: Django UserProfile model instance
             profile: UserProfile domain entity
+            
+        Returns:
+            Dictionary of model field values
         """
-        django_profile.subscription_type = profile.subscription_type
-        django_profile.skin_type = profile.skin_type
-        django_profile.age_range = profile.age_range
-        django_profile.set_skin_concerns_list(profile.skin_concerns)
-        django_profile.set_dermatological_conditions_list(profile.dermatological_conditions)
-        django_profile.dermatological_other = profile.dermatological_other
-        django_profile.set_allergies_list(profile.allergies)
-        django_profile.allergies_other = profile.allergies_other
-        django_profile.product_style = profile.product_style
-        django_profile.routine_frequency = profile.routine_frequency
-        django_profile.set_objectives_list(profile.objectives)
-        django_profile.budget = profile.budget
+        return {
+            'subscription_type': profile.subscription_type,
+            'skin_type': profile.skin_type,
+            'age_range': profile.age_range,
+            'skin_concerns': profile.skin_concerns,
+            'dermatological_conditions': profile.dermatological_conditions,
+            'dermatological_other': profile.dermatological_other,
+            'allergies': profile.allergies,
+            'allergies_other': profile.allergies_other,
+            'product_style': profile.product_style,
+            'routine_frequency': profile.routine_frequency,
+            'objectives': profile.objectives,
+            'budget': profile.budget,
+        }
@@ -14,6 +14,12 @@ from interfaces.repositories.user_repository import UserRepository
 
 logger = logging.getLogger(__name__)
 
+# Columns mapped from the User entity; password and login timestamps are never rewritten
+USER_UPDATE_FIELDS = [
+    'username', 'email', 'first_name', 'last_name',
+    'is_active', 'is_staff', 'is_superuser',
+]
+
 
 class DjangoUserRepository(UserRepository):
     """
@@ -104,7 +110,7 @@ class DjangoUserRepository(UserRepository):
                 django_user.is_active = user.is_active
                 django_user.is_staff = user.is_staff
                 django_user.is_superuser = user.is_superuser
-                django_user.save()
+                django_user.save(update_fields=USER_UPDATE_FIELDS)
                 logger.info(f"Updated user {user.id}")
             else:
                 # Create new user
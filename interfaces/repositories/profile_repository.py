@@ -35,6 +35,23 @@ class ProfileRepository(ABC):
         """
         pass
     
+    @abstractmethod
+    def get_user_with_profile(self, user_id: int, for_update: bool = False) -> Optional[UserProfile]:
+        """
+        Get user and profile together in a single data access round-trip.
+        
+        Args:
+            user_id: User identifier
+            for_update: Lock the rows until the surrounding transaction ends
+            
+        Returns:
+            UserProfile entity (carrying its User) or None if not found
+            
+        Raises:
+            ProfileNotFoundError: If profile cannot be retrieved
+        """
+        pass
+    
     @abstractmethod
     def get_by_user(self, user: User) -> Optional[UserProfile]:
         """
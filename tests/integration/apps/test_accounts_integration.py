@@ -6,10 +6,19 @@ with the Clean Architecture refactoring.
 """
 
 import json
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_login_failed
 from django.urls import reverse
-from apps.accounts.models import UserProfile
+from django.core.signing import TimestampSigner
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from django.core.cache import cache
+from apps.accounts.models import (
+    Allergy, UserProfile, allergies_cache_key, create_users_with_profiles, profile_cache_key
+)
+from apps.accounts.backends import ProfileModelBackend
+from common.premium_utils import force_premium_for_development
 
 
 class TestAccountsIntegration(TestCase):
@@ -67,6 +76,65 @@ class TestAccountsIntegration(TestCase):
         self.assertEqual(response.status_code, 200)  # Stay on login page
         self.assertContains(response, 'Connexion')
 
+    def test_failed_login_sends_signal(self):
+        """Test a wrong password fires user_login_failed like authenticate() does."""
+        received = []
+
+        def on_login_failed(sender, credentials, **kwargs):
+            received.append(credentials)
+
+        user_login_failed.connect(on_login_failed)
+        try:
+            self.client.post('/login/', {
+                'email': 'test@example.com',
+                'password': 'wrongpassword'
+            })
+        finally:
+            user_login_failed.disconnect(on_login_failed)
+        self.assertEqual(received, [{'username': 'test@example.com'}])
+
+    def test_login_after_password_change(self):
+        """Test login checks the current password after a change."""
+        response = self.client.post('/login/', {
+            'email': 'test@example.com',
+            'password': 'newpass456'
+        })
+        self.assertEqual(response.status_code, 200)
+
+        self.user.set_password('newpass456')
+        self.user.save()
+
+        response = self.client.post('/login/', {
+            'email': 'test@example.com',
+            'password': 'newpass456'
+        })
+        self.assertEqual(response.status_code, 302)
+
+    def _verification_query(self, user_id):
+        """Build the uid/token query string of an email validation link."""
+        return {
+            'uid': urlsafe_base64_encode(force_bytes(user_id)),
+            'token': TimestampSigner().sign(str(user_id)),
+        }
+
+    def test_verify_email_activates_account(self):
+        """Test the validation link activates the account, and again is harmless."""
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get('/signup/verify/', self._verification_query(self.user.pk))
+        self.assertRedirects(response, '/login/', fetch_redirect_response=False)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_active)
+
+        response = self.client.get('/signup/verify/', self._verification_query(self.user.pk))
+        self.assertRedirects(response, '/login/', fetch_redirect_response=False)
+
+    def test_verify_email_unknown_account(self):
+        """Test a validation link for a missing account goes back to signup."""
+        response = self.client.get('/signup/verify/', self._verification_query(99999))
+        self.assertRedirects(response, '/signup/', fetch_redirect_response=False)
+
     def test_profile_page_requires_login(self):
         """Test that profile page requires login."""
         response = self.client.get('/profile/')
@@ -79,6 +147,44 @@ class TestAccountsIntegration(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'testuser')
 
+    def test_session_user_loaded_with_profile(self):
+        """Test the auth backend resolves the user and profile in one query."""
+        with self.assertNumQueries(1):
+            user = ProfileModelBackend().get_user(self.user.pk)
+            self.assertEqual(user.profile.skin_type, 'combination')
+
+    def test_session_with_default_backend_stays_authenticated(self):
+        """Test sessions recorded under the default ModelBackend stay logged in."""
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        response = self.client.get('/profile/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'testuser')
+
+    def test_create_users_with_profiles(self):
+        """Test bulk user creation also creates the profiles."""
+        # One INSERT per table, plus the atomic block's savepoint pair
+        with self.assertNumQueries(4):
+            users = create_users_with_profiles([
+                {'username': 'bulk1', 'email': 'bulk1@example.com', 'password': 'testpass123'},
+                {'username': 'bulk2', 'email': 'bulk2@example.com', 'password': 'testpass123'},
+            ])
+
+        self.assertEqual(UserProfile.objects.filter(user__in=users).count(), 2)
+        self.assertTrue(User.objects.get(username='bulk1').check_password('testpass123'))
+
+    def test_profile_page_conditional_get(self):
+        """Test an unchanged profile page is answered with 304 Not Modified."""
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.get('/profile/')
+        etag = response['ETag']
+
+        response = self.client.get('/profile/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Allergy.objects.create(user=self.user, ingredient_name='Limonene')
+        response = self.client.get('/profile/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
     def test_profile_update(self):
         """Test profile update functionality."""
         self.client.login(username='testuser', password='testpass123')
@@ -166,6 +272,15 @@ class TestAccountsIntegration(TestCase):
         response = self.client.get('/profile/')
         self.assertEqual(response.status_code, 302)  # Redirect to login
 
+    def test_delete_account(self):
+        """Test account deletion removes the user and cascades to the profile."""
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.post('/delete-account/')
+
+        self.assertRedirects(response, '/login/', fetch_redirect_response=False)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(UserProfile.objects.filter(user_id=self.user.pk).exists())
+
     def test_profile_with_allergies(self):
         """Test profile with allergies data."""
         # Add allergies to profile
@@ -181,6 +296,51 @@ class TestAccountsIntegration(TestCase):
         self.assertContains(response, 'sulfate')
         self.assertContains(response, 'fragrance')
 
+    def test_profile_lists_allergy_records(self):
+        """Test the profile page lists the user's allergy records."""
+        Allergy.objects.create(user=self.user, ingredient_name='Limonene', severity='severe')
+
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.get('/profile/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Limonene')
+
+    def test_allergy_changes_invalidate_cache(self):
+        """Test cached allergy records are dropped when an allergy changes."""
+        cache.set(allergies_cache_key(self.user.id), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            allergy = Allergy.objects.create(user=self.user, ingredient_name='Limonene')
+        self.assertIsNone(cache.get(allergies_cache_key(self.user.id)))
+
+        cache.set(allergies_cache_key(self.user.id), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            allergy.delete()
+        self.assertIsNone(cache.get(allergies_cache_key(self.user.id)))
+
+    @override_settings(DEBUG=True, IS_PREMIUM_DEV_MODE=True, AUTHORIZED_DEV_USERS=['testuser'])
+    def test_force_premium_bumps_profile_etag(self):
+        """Test a forced Premium upgrade changes updated_at and drops cached data."""
+        previous_updated_at = self.profile.updated_at
+        cache.set(profile_cache_key(self.user.id), {'subscription_type': 'free'})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(force_premium_for_development(self.user), 1)
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.subscription_type, 'premium')
+        self.assertGreater(self.profile.updated_at, previous_updated_at)
+        self.assertIsNone(cache.get(profile_cache_key(self.user.id)))
+
+    def test_profile_cache_dropped_after_commit(self):
+        """Test the cached profile is only dropped once the change is committed."""
+        cache.set(profile_cache_key(self.user.id), {'skin_type': 'combination'})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.skin_type = 'dry'
+            self.profile.save()
+            # A read before commit would cache the old row again, so the key stays
+            self.assertIsNotNone(cache.get(profile_cache_key(self.user.id)))
+        self.assertIsNone(cache.get(profile_cache_key(self.user.id)))
+
     def test_profile_with_skin_concerns(self):
         """Test profile with skin concerns data."""
         # Add skin concerns to profile
@@ -0,0 +1,128 @@
+"""
+Integration tests for ai_routines app.
+
+Tests the Premium AI service request path with the AI backend stubbed out.
+"""
+
+import pickle
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from apps.accounts.models import Allergy
+from apps.ai_routines.services.premium_service import (
+    PremiumAIService, DERMATOLOGICAL_KNOWLEDGE, PRODUCT_DATABASE
+)
+from apps.scans.models import Scan
+
+AI_ROUTINE_ANSWER = (
+    '{"routine": {"matin": [{"type": "nettoyant", "produit": "Gel doux", '
+    '"marque": "CeraVe", "prix": 12.99, "score": 85, "explication": "Doux"}], "soir": []}}'
+)
+
+
+class TestPremiumAIServiceIntegration(TestCase):
+    """Integration tests for the Premium AI service."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.service = PremiumAIService()
+        self.user = User.objects.create_user(
+            username='premiumuser',
+            email='premium@example.com',
+            password='testpass123'
+        )
+        self.profile = self.user.profile
+        self.profile.skin_type = 'dry'
+        self.profile.age_range = '26-35'
+        self.profile.save()
+
+    def _request_routine(self):
+        """Send the same routine question, counting how often the context is rebuilt."""
+        with mock.patch.object(self.service, '_build_context', wraps=self.service._build_context) as build:
+            response = self.service.process_premium_request(self.user, 'Routine visage matin')
+        return response, build.call_count
+
+    @override_settings(ENABLE_AI_FALLBACK_MODE=False, OLLAMA_URL='http://ollama.test')
+    def test_response_cached_until_context_changes(self):
+        """Test a response is reused, then rebuilt after profile, allergy or scan changes."""
+        with mock.patch.object(PremiumAIService, '_call_ollama', return_value=AI_ROUTINE_ANSWER):
+            response, builds = self._request_routine()
+            self.assertFalse(response['fallback'])
+            self.assertEqual(builds, 1)
+            self.assertEqual(self._request_routine()[1], 0)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.profile.skin_type = 'oily'
+                self.profile.save()
+            self.assertEqual(self._request_routine()[1], 1)
+            self.assertEqual(self._request_routine()[1], 0)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                Allergy.objects.create(user=self.user, ingredient_name='Parfum')
+            self.assertEqual(self._request_routine()[1], 1)
+            self.assertEqual(self._request_routine()[1], 0)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                Scan.objects.create(user=self.user, scan_type='barcode', barcode='123456789')
+            self.assertEqual(self._request_routine()[1], 1)
+
+    @override_settings(ENABLE_AI_FALLBACK_MODE=False, OLLAMA_URL='http://ollama.test')
+    def test_fallback_response_not_cached(self):
+        """Test canned answers served during an AI outage are not cached."""
+        with mock.patch.object(PremiumAIService, '_call_ollama', side_effect=ConnectionError):
+            response, builds = self._request_routine()
+            self.assertTrue(response['fallback'])
+            self.assertEqual(builds, 1)
+            self.assertEqual(self._request_routine()[1], 1)
+
+        with mock.patch.object(PremiumAIService, '_call_ollama', return_value=AI_ROUTINE_ANSWER):
+            response, builds = self._request_routine()
+        self.assertFalse(response['fallback'])
+        self.assertEqual(response['routine']['routine']['matin'][0]['produit'], 'Gel doux')
+
+    def test_response_cannot_mutate_shared_knowledge(self):
+        """Test responses and callers cannot alter the module-level knowledge."""
+        response = self.service.process_premium_request(self.user, 'Routine visage matin')
+
+        recommended = response['skin_analysis']['recommended_ingredients']
+        self.assertEqual(recommended, DERMATOLOGICAL_KNOWLEDGE['skin_types']['dry']['recommended_ingredients'])
+        with self.assertRaises(AttributeError):
+            recommended.append('Parfum')
+        with self.assertRaises(TypeError):
+            DERMATOLOGICAL_KNOWLEDGE['skin_types']['dry']['needs'][0] = 'Parfum'
+        with self.assertRaises(TypeError):
+            PRODUCT_DATABASE[0]['price'] = 0
+        # Responses are cached, so they must stay picklable
+        pickle.dumps(response)
+
+    def test_parse_routine_json_wrapped_in_text(self):
+        """Test the routine JSON is decoded even with text before and after it."""
+        ai_response = (
+            'Voici votre routine personnalisée :\n'
+            '{"routine": {"matin": [{"type": "nettoyant", "produit": "Gel doux", '
+            '"marque": "CeraVe", "prix": 12.99, "score": 85, "explication": "Doux"}], '
+            '"soir": []}, "conseils": ["Hydratez"]}\n'
+            'Bonne routine !'
+        )
+
+        routine_data = self.service._parse_ai_routine_response(ai_response, 'morning')
+
+        self.assertEqual(routine_data['routine']['matin'][0]['produit'], 'Gel doux')
+        self.assertEqual(routine_data['routine']['soir'], [])
+        self.assertEqual(routine_data['conseils'], ['Hydratez'])
+
+    def test_parse_routine_text_without_json(self):
+        """Test text answers without JSON are still parsed line by line."""
+        ai_response = (
+            'Routine du matin :\n'
+            '1. Gel doux - CeraVe (12.99€)\n'
+            'Routine du soir :\n'
+            '1. Baume réparateur - Avène (18.5€)\n'
+        )
+
+        routine_data = self.service._parse_ai_routine_response(ai_response, 'morning')
+
+        self.assertEqual(routine_data['routine']['matin'][0]['marque'], 'CeraVe')
+        self.assertEqual(routine_data['routine']['soir'][0]['prix'], 18.5)
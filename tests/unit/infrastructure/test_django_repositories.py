@@ -143,6 +143,20 @@ class TestDjangoProfileRepository(TestCase):
         result = self.repository.get_by_user_id(99999)
         self.assertIsNone(result)
 
+    def test_get_user_with_profile_single_query(self):
+        """Test user and profile are loaded in a single query."""
+        with self.assertNumQueries(1):
+            result = self.repository.get_user_with_profile(self.django_user.id)
+            self.assertEqual(result.user.username, 'testuser')
+
+        self.assertEqual(result.skin_concerns, ['acne', 'aging'])
+        self.assertEqual(result.allergies, ['paraben'])
+
+    def test_get_user_with_profile_not_found(self):
+        """Test aggregate retrieval when user doesn't exist."""
+        result = self.repository.get_user_with_profile(99999)
+        self.assertIsNone(result)
+
     def test_get_by_user_success(self):
         """Test successful profile retrieval by user entity."""
         user = User(
@@ -181,6 +195,19 @@ class TestDjangoProfileRepository(TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].age_range, AgeRange.ADULT)
 
+    def test_save_existing_profile_single_query(self):
+        """Test updating a profile issues a single UPDATE."""
+        profile = self.repository.get_by_user_id(self.django_user.id)
+        profile._skin_concerns = ['redness']
+        profile._allergies = []
+
+        with self.assertNumQueries(1):
+            self.repository.save(profile)
+
+        self.django_profile.refresh_from_db()
+        self.assertEqual(self.django_profile.skin_concerns, ['redness'])
+        self.assertEqual(self.django_profile.allergies, [])
+
     def test_get_premium_users(self):
         """Test retrieving premium users."""
         self.django_profile.subscription_type = 'premium'
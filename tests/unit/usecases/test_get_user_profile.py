@@ -56,15 +56,13 @@ class TestGetUserProfileUseCase(unittest.TestCase):
     def test_execute_success(self):
         """Test successful profile retrieval."""
         # Setup mocks
-        self.mock_user_repository.get_by_id.return_value = self.test_user
-        self.mock_profile_repository.get_by_user_id.return_value = self.test_profile
+        self.mock_profile_repository.get_user_with_profile.return_value = self.test_profile
         
         # Execute use case
         result = self.use_case.execute(1)
         
         # Verify calls
-        self.mock_user_repository.get_by_id.assert_called_once_with(1)
-        self.mock_profile_repository.get_by_user_id.assert_called_once_with(1)
+        self.mock_profile_repository.get_user_with_profile.assert_called_once_with(1)
         
         # Verify result
         self.assertIsNotNone(result)
@@ -76,42 +74,39 @@ class TestGetUserProfileUseCase(unittest.TestCase):
     def test_execute_user_not_found(self):
         """Test user not found raises exception."""
         # Setup mocks
-        self.mock_user_repository.get_by_id.return_value = None
+        self.mock_profile_repository.get_user_with_profile.return_value = None
+        self.mock_user_repository.exists.return_value = False
         
         # Execute and verify exception
         with self.assertRaises(UserNotFoundError):
             self.use_case.execute(999)
         
         # Verify calls
-        self.mock_user_repository.get_by_id.assert_called_once_with(999)
-        self.mock_profile_repository.get_by_user_id.assert_not_called()
+        self.mock_profile_repository.get_user_with_profile.assert_called_once_with(999)
 
     def test_execute_profile_not_found(self):
         """Test profile not found raises exception."""
         # Setup mocks
-        self.mock_user_repository.get_by_id.return_value = self.test_user
-        self.mock_profile_repository.get_by_user_id.return_value = None
+        self.mock_profile_repository.get_user_with_profile.return_value = None
+        self.mock_user_repository.exists.return_value = True
         
         # Execute and verify exception
         with self.assertRaises(ProfileNotFoundError):
             self.use_case.execute(1)
         
         # Verify calls
-        self.mock_user_repository.get_by_id.assert_called_once_with(1)
-        self.mock_profile_repository.get_by_user_id.assert_called_once_with(1)
+        self.mock_profile_repository.get_user_with_profile.assert_called_once_with(1)
 
     def test_execute_with_user_entity_success(self):
         """Test successful profile retrieval returning domain entity."""
         # Setup mocks
-        self.mock_user_repository.get_by_id.return_value = self.test_user
-        self.mock_profile_repository.get_by_user_id.return_value = self.test_profile
+        self.mock_profile_repository.get_user_with_profile.return_value = self.test_profile
         
         # Execute use case
         result = self.use_case.execute_with_user_entity(1)
         
         # Verify calls
-        self.mock_user_repository.get_by_id.assert_called_once_with(1)
-        self.mock_profile_repository.get_by_user_id.assert_called_once_with(1)
+        self.mock_profile_repository.get_user_with_profile.assert_called_once_with(1)
         
         # Verify result
         self.assertIsNotNone(result)
@@ -120,7 +115,8 @@ class TestGetUserProfileUseCase(unittest.TestCase):
     def test_execute_with_user_entity_user_not_found(self):
         """Test user not found returns None for entity method."""
         # Setup mocks
-        self.mock_user_repository.get_by_id.return_value = None
+        self.mock_profile_repository.get_user_with_profile.return_value = None
+        self.mock_user_repository.exists.return_value = False
         
         # Execute use case
         result = self.use_case.execute_with_user_entity(999)
@@ -129,14 +125,13 @@ class TestGetUserProfileUseCase(unittest.TestCase):
         self.assertIsNone(result)
         
         # Verify calls
-        self.mock_user_repository.get_by_id.assert_called_once_with(999)
-        self.mock_profile_repository.get_by_user_id.assert_not_called()
+        self.mock_profile_repository.get_user_with_profile.assert_called_once_with(999)
 
     def test_execute_with_user_entity_profile_not_found(self):
         """Test profile not found returns None for entity method."""
         # Setup mocks
-        self.mock_user_repository.get_by_id.return_value = self.test_user
-        self.mock_profile_repository.get_by_user_id.return_value = None
+        self.mock_profile_repository.get_user_with_profile.return_value = None
+        self.mock_user_repository.exists.return_value = True
         
         # Execute use case
         result = self.use_case.execute_with_user_entity(1)
@@ -145,8 +140,7 @@ class TestGetUserProfileUseCase(unittest.TestCase):
         self.assertIsNone(result)
         
         # Verify calls
-        self.mock_user_repository.get_by_id.assert_called_once_with(1)
-        self.mock_profile_repository.get_by_user_id.assert_called_once_with(1)
+        self.mock_profile_repository.get_user_with_profile.assert_called_once_with(1)
 
     def test_execute_with_premium_user(self):
         """Test profile retrieval for premium user."""
@@ -168,8 +162,7 @@ class TestGetUserProfileUseCase(unittest.TestCase):
         )
         
         # Setup mocks
-        self.mock_user_repository.get_by_id.return_value = self.test_user
-        self.mock_profile_repository.get_by_user_id.return_value = premium_profile
+        self.mock_profile_repository.get_user_with_profile.return_value = premium_profile
         
         # Execute use case
         result = self.use_case.execute(1)
@@ -202,8 +195,7 @@ class TestGetUserProfileUseCase(unittest.TestCase):
         )
         
         # Setup mocks
-        self.mock_user_repository.get_by_id.return_value = self.test_user
-        self.mock_profile_repository.get_by_user_id.return_value = complex_profile
+        self.mock_profile_repository.get_user_with_profile.return_value = complex_profile
         
         # Execute use case
         result = self.use_case.execute(1)
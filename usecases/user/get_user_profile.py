@@ -50,14 +50,12 @@ class GetUserProfileUseCase:
             UserNotFoundError: If user cannot be found
             ProfileNotFoundError: If profile cannot be found
         """
-        # Get user entity
-        user = self._user_repository.get_by_id(user_id)
-        if not user:
-            raise UserNotFoundError(f"User with ID {user_id} not found")
-        
-        # Get user profile
-        profile = self._profile_repository.get_by_user_id(user_id)
+        # Get user and profile in a single round-trip
+        profile = self._profile_repository.get_user_with_profile(user_id)
         if not profile:
+            # Only hit the user table again to report the right error
+            if not self._user_repository.exists(user_id):
+                raise UserNotFoundError(f"User with ID {user_id} not found")
             raise ProfileNotFoundError(f"Profile for user {user_id} not found")
         
         # Convert to dictionary format for backward compatibility
@@ -73,11 +71,5 @@ class GetUserProfileUseCase:
         Returns:
             UserProfile entity or None if not found
         """
-        # Get user entity
-        user = self._user_repository.get_by_id(user_id)
-        if not user:
-            return None
-        
-        # Get user profile
-        profile = self._profile_repository.get_by_user_id(user_id)
-        return profile
+        # Get user and profile in a single round-trip
+        return self._profile_repository.get_user_with_profile(user_id)
@@ -40,6 +40,9 @@ class UpdateUserProfileUseCase:
         """
         Execute the update user profile use case.
         
+        Must run inside a database transaction, which holds the row lock
+        taken on the current profile until both entities are saved.
+        
         Args:
             user_id: User identifier
             profile_data: Dictionary containing profile updates
@@ -52,15 +55,14 @@ class UpdateUserProfileUseCase:
             ProfileNotFoundError: If profile cannot be found
             InvalidInputException: If profile data is invalid
         """
-        # Get user entity
-        user = self._user_repository.get_by_id(user_id)
-        if not user:
-            raise UserNotFoundError(f"User with ID {user_id} not found")
-        
-        # Get current profile
-        current_profile = self._profile_repository.get_by_user_id(user_id)
+        # Get current profile and its user in a single round-trip, locked so
+        # concurrent writers (e.g. payment confirmation) are not overwritten
+        current_profile = self._profile_repository.get_user_with_profile(user_id, for_update=True)
         if not current_profile:
+            if not self._user_repository.exists(user_id):
+                raise UserNotFoundError(f"User with ID {user_id} not found")
             raise ProfileNotFoundError(f"Profile for user {user_id} not found")
+        user = current_profile.user
         
         # Validate and update user data
         self._update_user_data(user, profile_data)